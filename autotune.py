@@ -0,0 +1,132 @@
+import csv
+import json
+import math
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from index_calculus import calculate_factor_base_bound
+from number_theory import is_probable_prime
+from prime_sieve import primes_up_to
+from smoothness import BatchSmoothnessTester
+from sparse_linalg import solve_sparse_mod
+
+INPUT_FILE = "dataset_created_during_the_execution_of_lab#2.csv"
+CACHE_FILE = "autotune_cache.json"
+C_CANDIDATES = (1.5, 2.0, 2.5, 3.38, 4.5, 6.0, 8.0, 11.0)
+SURPLUS_CANDIDATES = (5, 10, 20, 30, 50, 80)
+PILOT_SAMPLES = 4096
+BUCKET_BITS = 4
+
+
+def bucket_of(p: int) -> int:
+    return p.bit_length() // BUCKET_BITS * BUCKET_BITS
+
+
+def pilot_sample(alpha: int, p: int, factor_base: List[int], samples: int, rng: random.Random) -> Tuple[float, float, List[Dict[int, int]]]:
+    n = p - 1
+    tester = BatchSmoothnessTester(factor_base)
+    smooth: List[Dict[int, int]] = []
+    start = time.perf_counter()
+    for _ in range(0, samples, 128):
+        vals = [pow(alpha, rng.randint(0, n - 1), p) for _ in range(128)]
+        smooth.extend(f for f in tester.factor_batch(vals) if f)
+    seconds_per_candidate = (time.perf_counter() - start) / tester.tested
+    return tester.smooth / tester.tested, seconds_per_candidate, smooth
+
+
+def linear_algebra_seconds(t: int, row_weight: float, rng: random.Random) -> float:
+    # вимірювання на синтетичній розрідженій системі меншого розміру з екстраполяцією O(t^2)
+    size = max(2, min(t, 40))
+    q = 1000003
+    while not is_probable_prime(q):
+        q += 2
+    weight = max(1, min(size, round(row_weight)))
+    rows = [{c: rng.randint(1, 5) for c in rng.sample(range(size), weight)} for _ in range(size + 5)]
+    b = [rng.randrange(q) for _ in rows]
+    start = time.perf_counter()
+    solve_sparse_mod(rows, b, size, q)
+    return (time.perf_counter() - start) * (t / size) ** 2
+
+
+def descent_success(smooth: List[Dict[int, int]], factor_base: List[int], relations: int) -> float:
+    # ймовірність, що логарифми всіх простих у гладкому кандидаті визначені після relations рівнянь
+    if not smooth:
+        return 0.0
+    counts: Dict[int, int] = {}
+    for factorization in smooth:
+        for q in factorization:
+            counts[q] = counts.get(q, 0) + 1
+    # частота простого серед гладких значень; для не побачених у пробній вибірці — апріорна 1/q
+    frequency = {q: counts[q] / len(smooth) if q in counts else 1 / q for q in factor_base}
+    known = {q: 1 - (1 - frequency[q]) ** relations for q in factor_base}
+    return sum(math.prod(known[q] for q in f) for f in smooth) / len(smooth)
+
+
+def tune(alpha: int, p: int, queries: int = 1, samples: int = PILOT_SAMPLES, seed: Optional[int] = None) -> Dict:
+    rng = random.Random(seed)
+    n = p - 1
+    best: Optional[Dict] = None
+    for c in C_CANDIDATES:
+        B = calculate_factor_base_bound(n, c)
+        factor_base = primes_up_to(B).tolist()
+        t = len(factor_base)
+        if t == 0:
+            continue
+        smooth_yield, per_candidate, smooth = pilot_sample(alpha, p, factor_base, samples, rng)
+        if smooth_yield == 0:
+            continue
+        row_weight = sum(len(f) for f in smooth) / len(smooth)
+        la_seconds = linear_algebra_seconds(t, row_weight, rng)
+        for surplus in SURPLUS_CANDIDATES:
+            relations = t + surplus
+            success = descent_success(smooth, factor_base, relations)
+            if success == 0:
+                continue
+            predicted = (relations / smooth_yield * per_candidate + la_seconds
+                         + queries * per_candidate / (smooth_yield * success))
+            if best is None or predicted < best["predicted_seconds"]:
+                best = {"c": c, "extra_equations": surplus, "B": B, "factor_base_size": t,
+                        "smooth_yield": smooth_yield, "predicted_seconds": predicted}
+    if best is None:
+        return {"c": 3.38, "extra_equations": 30, "predicted_seconds": None}
+    return best
+
+
+def load_cache(filename: str = CACHE_FILE) -> Dict[str, Dict]:
+    if not os.path.isfile(filename):
+        return {}
+    with open(filename) as file:
+        return json.load(file)
+
+
+def save_cache(cache: Dict[str, Dict], filename: str = CACHE_FILE) -> None:
+    tmp = filename + ".tmp"
+    with open(tmp, "w") as file:
+        json.dump(cache, file, indent=2)
+    os.replace(tmp, filename)
+
+
+def tuned_parameters(alpha: int, p: int, filename: str = CACHE_FILE) -> Tuple[float, int]:
+    cache = load_cache(filename)
+    key = str(bucket_of(p))
+    if key not in cache:
+        cache[key] = tune(alpha, p)
+        save_cache(cache, filename)
+    return cache[key]["c"], cache[key]["extra_equations"]
+
+
+if __name__ == "__main__":
+    input_file = sys.argv[1] if len(sys.argv) > 1 else INPUT_FILE
+    cache = load_cache()
+    with open(input_file, newline="") as csvfile:
+        for row in csv.DictReader(csvfile):
+            alpha, p = int(row["alpha"]), int(row["p"])
+            key = str(bucket_of(p))
+            if key in cache:
+                continue
+            cache[key] = tune(alpha, p)
+            print(f"p ~ 2^{key}: c = {cache[key]['c']}, extra_equations = {cache[key]['extra_equations']}")
+    save_cache(cache)
@@ -0,0 +1,207 @@
+import argparse
+import csv
+import io
+import multiprocessing as mp
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple, Union
+
+from index_calculus import index_calculus_many
+from cancellation import run_with_deadline
+from relation_log import RelationLog
+
+INPUT_FILE = "dataset_created_during_the_execution_of_lab#2.csv"
+OUTPUT_FILE = "index_calculus_batch_results.csv"
+TIMEOUT_SECONDS = 300
+FIELDNAMES = ["problem_type", "order_prime_number", "alpha", "beta", "p", "result_x", "time_seconds"]
+
+Row = Dict[str, str]
+RowKey = Tuple[int, int, int, int, int]
+
+
+def row_key(row: Row) -> RowKey:
+    return (int(row["problem_type"]), int(row["order_prime_number"]),
+            int(row["alpha"]), int(row["beta"]), int(row["p"]))
+
+
+def is_solved(row: Row) -> bool:
+    return (row.get("result_x") or "").strip().lstrip("-").isdigit()
+
+
+def prune_unsolved_rows(filename: str) -> Counter:
+    # рядки, уже розв'язані попереднім (можливо, перерваним) запуском, лишаються у файлі, а timeout
+    # і error видаляються: вони повторюються (збір рівнянь продовжується з журналу) і дописуються
+    # заново, тож у файлі залишається по одному рядку на кожен вхідний
+    if not os.path.isfile(filename):
+        return Counter()
+    with open(filename, newline="") as csvfile:
+        text = csvfile.read()
+    # недописаний рядок перерваного запуску не враховується
+    text = text[:text.rfind("\n") + 1]
+    solved = [row for row in csv.DictReader(io.StringIO(text, newline="")) if is_solved(row)]
+    tmp_path = filename + ".tmp"
+    with open(tmp_path, "w", newline="") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=FIELDNAMES, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(solved)
+    os.replace(tmp_path, filename)
+    return Counter(row_key(row) for row in solved)
+
+
+class ResultWriter:
+    """Єдиний буферизований запис результатів у CSV.
+
+    Якщо задано order (індекси рядків у порядку вхідного файлу), рядки виводяться
+    саме в цьому порядку: завершені раніше чекають у буфері на попередні. Без order
+    рядки пишуться в порядку завершення — після аварії втрачається найменше.
+    """
+
+    def __init__(self, filename: str, order: Optional[List[int]] = None):
+        write_header = not os.path.isfile(filename) or os.path.getsize(filename) == 0
+        if not write_header:
+            with open(filename, "rb+") as file:
+                data = file.read()
+                if not data.endswith(b"\n"):
+                    # недописаний рядок перерваного запуску
+                    file.truncate(data.rfind(b"\n") + 1)
+        self.file = open(filename, "a", newline="")
+        self.writer = csv.writer(self.file)
+        if write_header:
+            self.writer.writerow(FIELDNAMES)
+        self.order = order
+        self._next = 0
+        self._pending: Dict[int, list] = {}
+        self.written = 0
+
+    def add(self, index: int, record: list) -> None:
+        if self.order is None:
+            self.writer.writerow(record)
+            self.written += 1
+            return
+        self._pending[index] = record
+        while self._next < len(self.order) and self.order[self._next] in self._pending:
+            self.writer.writerow(self._pending.pop(self.order[self._next]))
+            self._next += 1
+            self.written += 1
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        # незавершені рядки (наприклад, після помилки) дописуються в кінці
+        for index in sorted(self._pending):
+            self.writer.writerow(self._pending.pop(index))
+            self.written += 1
+        self.file.close()
+
+
+def run_group(alpha: int, p: int, betas: List[int], seconds: float) -> Dict:
+    try:
+        # розв'язувач працює в окремому процесі й примусово зупиняється після seconds;
+        # зібрані рівняння лишаються в журналі, і повторний запуск продовжить збір із них
+        # процеси-розв'язувачі запускаються з потоків, тож не fork, а forkserver
+        return run_with_deadline(index_calculus_many, (alpha, betas, p - 1, p),
+                                 {"relation_log": RelationLog()}, seconds=seconds, context=mp.get_context("forkserver"))
+    except Exception as e:
+        return {"status": "error", "value": repr(e), "items": [], "progress": {}, "elapsed": 0.0}
+
+
+def solve_group(alpha: int, p: int, rows: List[Tuple[int, Row]], seconds: float) -> List[Tuple[int, Row, Union[int, str], float]]:
+    # результат рядка — знайдений x, "timeout" (не розв'язано вчасно) або "error"
+    rows_by_beta: Dict[int, List[Tuple[int, Row]]] = {}
+    for index, row in rows:
+        rows_by_beta.setdefault(int(row["beta"]) % p, []).append((index, row))
+
+    results = []
+    run = run_group(alpha, p, list(rows_by_beta), seconds)
+    if run["status"] == "error" and len(rows_by_beta) > 1:
+        # помилку однієї β не можна приписувати всій групі: решта β розв'язується окремо
+        print(f"Помилка в групі p = {p}, α = {alpha}: {run['value']}; β розв'язуються окремо")
+        for beta in [beta for beta in rows_by_beta if beta not in {item[0][0] for item in run["items"]}]:
+            single = run_group(alpha, p, [beta], seconds)
+            results.extend(_group_results(alpha, p, {beta: rows_by_beta.pop(beta)}, single, seconds))
+    results.extend(_group_results(alpha, p, rows_by_beta, run, seconds))
+    return results
+
+
+def _group_results(alpha: int, p: int, rows_by_beta: Dict[int, List[Tuple[int, Row]]], run: Dict, seconds: float) -> List[Tuple[int, Row, Union[int, str], float]]:
+    results = []
+    last_time = 0.0
+    for (beta, x), arrived in run["items"]:
+        if beta not in rows_by_beta:
+            continue
+        # спільна передобчислювальна частина враховується в першому знайденому β
+        elapsed = arrived - last_time
+        last_time = arrived
+
+        if x is not None:
+            print(f"[{p}] x = {x}, перевірка: {alpha}^{x} ≡ {pow(alpha, x, p)} ≡ {beta} mod {p}")
+            print(f"    Час виконання: {elapsed:.4f} сек")
+        else:
+            print(f"[{p}] Розв’язок не знайдено для β = {beta}")
+        results.extend((index, row, x if x is not None else "timeout", elapsed) for index, row in rows_by_beta.pop(beta))
+
+    if not rows_by_beta:
+        return results
+    if run["status"] == "error":
+        print(f"Помилка в групі p = {p}, α = {alpha}: {run['value']}")
+    else:
+        progress = run["progress"]
+        details = ", ".join(f"{key} = {value}" for key, value in progress.items() if key != "phase")
+        print(f"[{p}] Перевищено ліміт {seconds} сек. на етапі {progress.get('phase', 'невідомо')}"
+              f"{': ' + details if details else ''}")
+    outcome = "error" if run["status"] == "error" else "timeout"
+    for beta_rows in rows_by_beta.values():
+        results.extend((index, row, outcome, run["elapsed"]) for index, row in beta_rows)
+    return results
+
+
+def run_batch(input_file: str = INPUT_FILE, output_file: str = OUTPUT_FILE, workers: Optional[int] = None, order: str = "input", seconds: float = TIMEOUT_SECONDS) -> int:
+    done = prune_unsolved_rows(output_file)
+    remaining: List[Tuple[int, Row]] = []
+    with open(input_file, newline="") as csvfile:
+        for index, row in enumerate(csv.DictReader(csvfile)):
+            key = row_key(row)
+            if done[key] > 0:
+                done[key] -= 1
+            else:
+                remaining.append((index, row))
+    if not remaining:
+        print("Усі рядки вже оброблено")
+        return 0
+
+    # рядки з однаковими (p, alpha) ділять факторну базу й розв'язуються однією задачею;
+    # задачі йдуть від найменших p до найбільших, щоб великі не затримували дрібні
+    groups: Dict[Tuple[int, int], List[Tuple[int, Row]]] = {}
+    for index, row in remaining:
+        groups.setdefault((int(row["p"]), int(row["alpha"])), []).append((index, row))
+    tasks = sorted(groups.items(), key=lambda item: (item[0][0], -len(item[1])))
+
+    writer = ResultWriter(output_file, [index for index, _ in remaining] if order == "input" else None)
+    try:
+        # кожна задача запускається у власному процесі (run_with_deadline), потоки лише чекають на них
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+            futures = [executor.submit(solve_group, alpha, p, rows, seconds) for (p, alpha), rows in tasks]
+            for future in as_completed(futures):
+                for index, row, x, elapsed in future.result():
+                    writer.add(index, [row["problem_type"], row["order_prime_number"], row["alpha"], row["beta"],
+                                       row["p"], x, elapsed])
+                writer.flush()
+    finally:
+        writer.close()
+    return writer.written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Паралельна пакетна обробка CSV з задачами дискретного логарифма")
+    parser.add_argument("--input", default=INPUT_FILE)
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--order", choices=("input", "completion"), default="input")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT_SECONDS,
+                        help="ліміт часу в секундах на групу рядків з однаковими (p, alpha), а не на окремий рядок: "
+                             "група ділить факторну базу й розв'язується одним процесом")
+    args = parser.parse_args()
+    written = run_batch(args.input, args.output, args.workers, args.order, args.timeout)
+    print(f"Записано рядків: {written}")
@@ -0,0 +1,60 @@
+import csv
+import os
+import sys
+import tempfile
+from collections import Counter
+
+from batch_runner import FIELDNAMES, is_solved, row_key, run_batch
+
+INPUT_FILE = "dataset_created_during_the_execution_of_lab#2.csv"
+MAX_P = 10 ** 6
+TIMEOUT_SECONDS = 30
+RUNS = 3
+
+
+def read_rows(filename: str) -> list:
+    with open(filename, newline="") as csvfile:
+        return list(csv.DictReader(csvfile))
+
+
+def main(input_file: str) -> int:
+    rows = [row for row in read_rows(input_file) if int(row["p"]) < MAX_P]
+    # β = 0 не має логарифма: такий рядок лишається нерозв'язаним і повторюється при кожному продовженні
+    unsolvable = dict(rows[0], beta="0", result_x="", time_seconds="")
+    rows.append(unsolvable)
+    expected = Counter(row_key(row) for row in rows)
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as directory:
+        batch_input = os.path.join(directory, "input.csv")
+        batch_output = os.path.join(directory, "output.csv")
+        with open(batch_input, "w", newline="") as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=FIELDNAMES)
+            writer.writeheader()
+            writer.writerows(rows)
+
+        solved_before: Counter = Counter()
+        # перший запуск і два продовження: у файлі завжди по одному рядку на вхідний
+        for run in range(RUNS):
+            run_batch(batch_input, batch_output, workers=1, seconds=TIMEOUT_SECONDS)
+            output = read_rows(batch_output)
+            keys = Counter(row_key(row) for row in output)
+            solved = Counter(row_key(row) for row in output if is_solved(row))
+            print(f"Запуск {run + 1}: рядків {len(output)} з {len(rows)}, розв'язано {sum(solved.values())}")
+            if keys != expected:
+                print("  рядки виходу не відповідають вхідним один до одного")
+                failures += 1
+            if solved_before - solved:
+                print("  продовження втратило вже розв'язані рядки")
+                failures += 1
+            if solved[row_key(unsolvable)]:
+                print("  рядок з β = 0 позначено розв'язаним")
+                failures += 1
+            solved_before = solved
+
+    print("resume: " + ("OK" if failures == 0 else f"{failures} помилок"))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1] if len(sys.argv) > 1 else INPUT_FILE))
@@ -0,0 +1,219 @@
+import argparse
+import contextlib
+import csv
+import io
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from index_calculus import index_calculus
+from index_calculus_parallel import index_calculus_parallel
+from instrumentation import Observer, PhaseProfiler
+from number_theory import factorize, is_probable_prime
+
+INPUT_FILE = "dataset_created_during_the_execution_of_lab#2.csv"
+OUTPUT_FILE = "benchmark_results.json"
+
+Instance = Tuple[int, int, int, int]  # (order_prime_number, alpha, beta, p)
+Engine = Callable[[int, int, int, Optional[Observer]], Optional[int]]
+
+ENGINES: Dict[str, Engine] = {
+    "serial": lambda alpha, beta, p, observer: index_calculus(alpha, beta, p - 1, p, observer=observer),
+    "parallel": lambda alpha, beta, p, observer: index_calculus_parallel(alpha, beta, p - 1, p, 8, observer=observer),
+    "staged": lambda alpha, beta, p, observer: index_calculus(alpha, beta, p - 1, p, observer=observer, staged_smoothness=True),
+}
+
+try:
+    from index_calculus_uint64 import index_calculus_uint64
+    ENGINES["uint64"] = lambda alpha, beta, p, observer: index_calculus_uint64(alpha, beta, p - 1, p, observer=observer)
+except ImportError:  # без NumPy порівнюються лише реалізації на цілих Python
+    pass
+
+
+def load_instances(filename: str = INPUT_FILE, max_digits: Optional[int] = None) -> List[Instance]:
+    instances = []
+    with open(filename, newline="") as csvfile:
+        for row in csv.DictReader(csvfile):
+            digits = int(row["order_prime_number"])
+            if max_digits is None or digits <= max_digits:
+                instances.append((digits, int(row["alpha"]), int(row["beta"]), int(row["p"])))
+    return instances
+
+
+def primitive_root(p: int) -> int:
+    factors = factorize(p - 1)
+    for g in range(2, p):
+        if all(pow(g, (p - 1) // q, p) != 1 for q in factors):
+            return g
+    raise ValueError(f"primitive_root: {p} is not prime")
+
+
+def generate_instances(digits: List[int], per_size: int, rng: random.Random) -> List[Instance]:
+    instances = []
+    for d in digits:
+        for _ in range(per_size):
+            p = rng.randrange(10 ** (d - 1), 10 ** d)
+            while not is_probable_prime(p):
+                p = rng.randrange(10 ** (d - 1), 10 ** d)
+            alpha = primitive_root(p)
+            instances.append((d, alpha, rng.randrange(1, p), p))
+    return instances
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    index = max(0, math.ceil(q * len(ordered)) - 1)
+    return ordered[index]
+
+
+def run_once(engine: Engine, instance: Instance, seed: int) -> Dict:
+    _, alpha, beta, p = instance
+    random.seed(seed)
+    profiler = PhaseProfiler()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        x = engine(alpha, beta, p, profiler)
+    elapsed = time.perf_counter() - start
+    relations = [entry for entry in profiler.phases if entry["phase"] == "relation_collection"]
+    found = sum(entry.get("relations", 0) for entry in relations)
+    return {
+        "seconds": elapsed,
+        "solved": x is not None and pow(alpha, x, p) == beta % p,
+        "phases": profiler.totals(),
+        "relations_per_second": relations[-1]["relations_per_second"] if relations else None,
+        # разом з повторними зборами; для staged показує ціну втрат раннього відсіювання
+        "candidates_per_relation": sum(entry.get("candidates_tested", 0) for entry in relations) / found if found else None,
+    }
+
+
+def summarize(runs: List[Dict]) -> Dict:
+    times = [run["seconds"] for run in runs]
+    rates = [run["relations_per_second"] for run in runs if run["relations_per_second"]]
+    costs = [run["candidates_per_relation"] for run in runs if run["candidates_per_relation"]]
+    phases: Dict[str, List[float]] = {}
+    for run in runs:
+        for name, seconds in run["phases"].items():
+            phases.setdefault(name, []).append(seconds)
+    return {
+        "runs": len(runs),
+        "solved_rate": sum(run["solved"] for run in runs) / len(runs),
+        "median_seconds": statistics.median(times),
+        "p95_seconds": percentile(times, 0.95),
+        "median_relations_per_second": statistics.median(rates) if rates else None,
+        "median_candidates_per_relation": statistics.median(costs) if costs else None,
+        "median_phase_seconds": {name: statistics.median(values) for name, values in phases.items()},
+    }
+
+
+def run_benchmark(instances: List[Instance], engines: List[str], seed: int, warmups: int, repeats: int) -> Dict:
+    results: Dict[str, Dict[str, Dict]] = {}
+    for engine_name in engines:
+        engine = ENGINES[engine_name]
+        by_size: Dict[int, List[Dict]] = {}
+        for index, instance in enumerate(instances):
+            for warmup in range(warmups):
+                run_once(engine, instance, seed + warmup)
+            for repeat in range(repeats):
+                run = run_once(engine, instance, seed + 1000 * (index + 1) + repeat)
+                by_size.setdefault(instance[0], []).append(run)
+            print(f"[{engine_name}] p = {instance[3]}: готово", file=sys.stderr)
+        results[engine_name] = {str(size): summarize(runs) for size, runs in sorted(by_size.items())}
+    return {
+        "seed": seed,
+        "warmups": warmups,
+        "repeats": repeats,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def early_abort_losses(report: Dict) -> List[str]:
+    # staged відкидає частину гладких кандидатів: скільки більше кандидатів він перебирає на рівняння, ніж serial
+    lines = []
+    serial, staged = report["results"].get("serial", {}), report["results"].get("staged", {})
+    for size, summary in staged.items():
+        base = serial.get(size)
+        if base is None or not base["median_candidates_per_relation"] or not summary["median_candidates_per_relation"]:
+            continue
+        extra = summary["median_candidates_per_relation"] / base["median_candidates_per_relation"] - 1
+        speedup = base["median_seconds"] / summary["median_seconds"]
+        lines.append(f"   staged order={size:>3}: кандидатів на рівняння {extra * 100:+.0f}% відносно serial, "
+                     f"час x{speedup:.2f}")
+    return lines
+
+
+def compare(baseline: Dict, candidate: Dict, threshold: float) -> List[str]:
+    regressions = []
+    for engine, sizes in candidate["results"].items():
+        for size, summary in sizes.items():
+            base = baseline["results"].get(engine, {}).get(size)
+            if base is None:
+                continue
+            for metric in ("median_seconds", "p95_seconds"):
+                if summary[metric] > base[metric] * (1 + threshold):
+                    regressions.append(f"{engine} order={size} {metric}: {base[metric]:.4f} -> {summary[metric]:.4f} "
+                                       f"(+{(summary[metric] / base[metric] - 1) * 100:.1f}%)")
+            if summary["solved_rate"] < base["solved_rate"]:
+                regressions.append(f"{engine} order={size} solved_rate: {base['solved_rate']:.2f} -> {summary['solved_rate']:.2f}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк реалізацій Index-Calculus")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run")
+    run.add_argument("--input", default=INPUT_FILE)
+    run.add_argument("--generate", type=int, nargs="*", metavar="DIGITS",
+                     help="згенерувати екземпляри з простими заданої кількості цифр замість датасету")
+    run.add_argument("--per-size", type=int, default=3)
+    run.add_argument("--max-digits", type=int, default=None)
+    run.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    run.add_argument("--seed", type=int, default=12345)
+    run.add_argument("--warmups", type=int, default=1)
+    run.add_argument("--repeats", type=int, default=5)
+    run.add_argument("--output", default=OUTPUT_FILE)
+
+    cmp = commands.add_parser("compare")
+    cmp.add_argument("baseline")
+    cmp.add_argument("candidate")
+    cmp.add_argument("--threshold", type=float, default=0.10)
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        if args.generate:
+            instances = generate_instances(args.generate, args.per_size, random.Random(args.seed))
+        else:
+            instances = load_instances(args.input, args.max_digits)
+        report = run_benchmark(instances, args.engines, args.seed, args.warmups, args.repeats)
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        for engine, sizes in report["results"].items():
+            for size, summary in sizes.items():
+                print(f"{engine:>9} order={size:>3}: median {summary['median_seconds']:.4f} с, "
+                      f"p95 {summary['p95_seconds']:.4f} с, розв'язано {summary['solved_rate'] * 100:.0f}%")
+        for line in early_abort_losses(report):
+            print(line)
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.candidate) as file:
+        candidate = json.load(file)
+    regressions = compare(baseline, candidate, args.threshold)
+    for line in regressions:
+        print(f"РЕГРЕСІЯ: {line}")
+    if not regressions:
+        print("Регресій не виявлено")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
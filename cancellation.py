@@ -0,0 +1,154 @@
+import multiprocessing as mp
+import os
+import signal
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+PROGRESS_INTERVAL = 0.5
+KILL_GRACE_SECONDS = 2.0
+
+
+class DeadlineExceeded(Exception):
+    def __init__(self, phase: str, progress: Dict):
+        super().__init__(f"deadline exceeded during {phase}")
+        self.phase = phase
+        self.progress = progress
+
+    def __reduce__(self):
+        # виняток із процесу пулу повертається через pickle
+        return DeadlineExceeded, (self.phase, self.progress)
+
+
+class Deadline:
+    """Токен скасування, який перевіряють усі тривалі цикли алгоритму.
+
+    Спрацьовує, коли минає seconds або коли викликано cancel(). Кожна перевірка
+    запам'ятовує поточний прогрес, тож після скасування відомо, на якому етапі
+    зупинилися обчислення і скільки встигли зробити.
+    """
+
+    def __init__(self, seconds: Optional[float] = None, on_progress: Optional[Callable[[Dict], None]] = None):
+        self.expires_at = time.monotonic() + seconds if seconds is not None else None
+        self.on_progress = on_progress
+        self.progress: Dict = {}
+        self._cancelled = threading.Event()
+        self._last_report = 0.0
+
+    def __reduce__(self):
+        # у інший процес (ProcessPoolExecutor) передається лише залишок часу: подія скасування
+        # й обробник прогресу там не діють, а показники monotonic різних процесів не порівнюють
+        remaining = 0.0 if self._cancelled.is_set() else self.remaining()
+        return Deadline, (remaining,)
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def expired(self) -> bool:
+        return self._cancelled.is_set() or (self.expires_at is not None and time.monotonic() >= self.expires_at)
+
+    def remaining(self) -> Optional[float]:
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def check(self, phase: str, **progress) -> None:
+        self.progress = {"phase": phase, **progress}
+        now = time.monotonic()
+        if self.on_progress is not None and now - self._last_report >= PROGRESS_INTERVAL:
+            self._last_report = now
+            self.on_progress(self.progress)
+        if self.expired():
+            raise DeadlineExceeded(phase, self.progress)
+
+
+def check_deadline(deadline: Optional[Deadline], phase: str, **progress) -> None:
+    if deadline is not None:
+        deadline.check(phase, **progress)
+
+
+def _child(connection, target: Callable, args: tuple, kwargs: dict, seconds: float) -> None:
+    # окрема група процесів, щоб разом із розв'язувачем можна було вбити і його пул воркерів
+    os.setpgrp()
+    deadline = Deadline(seconds, on_progress=lambda progress: connection.send(("progress", progress)))
+    try:
+        result = target(*args, deadline=deadline, **kwargs)
+        if hasattr(result, "__next__"):
+            for item in result:
+                connection.send(("item", item))
+            result = None
+        connection.send(("done", result))
+    except DeadlineExceeded as e:
+        connection.send(("timeout", e.progress))
+    except Exception as e:
+        connection.send(("error", repr(e)))
+    finally:
+        connection.close()
+
+
+def _kill_group(process: mp.Process) -> None:
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        try:
+            os.killpg(process.pid, sig)
+        except (ProcessLookupError, PermissionError):
+            # дочірній процес ще не встиг викликати os.setpgrp(): групи немає, вбивається сам процес
+            if sig == signal.SIGTERM:
+                process.terminate()
+            else:
+                process.kill()
+        process.join(KILL_GRACE_SECONDS)
+        if not process.is_alive():
+            return
+    # SIGKILL не перехоплюється, тож після нього процес гарантовано завершується
+    process.kill()
+    process.join()
+
+
+def run_with_deadline(target: Callable, args: tuple = (), kwargs: Optional[dict] = None, seconds: float = 300.0, context: Optional[Any] = None) -> Dict[str, Any]:
+    """Запускає target в окремому процесі з жорстким обмеженням часу.
+
+    target отримує іменований аргумент deadline і може повернути значення
+    або ітератор (елементи передаються батьківському процесу одразу). Якщо
+    процес не завершився вчасно, його група процесів примусово вбивається.
+    context — контекст multiprocessing для запуску (наприклад, forkserver, якщо
+    виклик іде з багатопотокового процесу); за замовчуванням — стандартний.
+    """
+    context = context or mp
+    parent_connection, child_connection = context.Pipe(duplex=False)
+    process = context.Process(target=_child, args=(child_connection, target, args, kwargs or {}, seconds))
+    start = time.monotonic()
+    process.start()
+    child_connection.close()
+
+    status, value, progress = "timeout", None, {}
+    items: List[tuple] = []
+    hard_deadline = start + seconds + KILL_GRACE_SECONDS
+    try:
+        while True:
+            remaining = hard_deadline - time.monotonic()
+            if remaining <= 0 or not parent_connection.poll(remaining):
+                break
+            try:
+                kind, payload = parent_connection.recv()
+            except EOFError:
+                status, value = "error", "solver process exited unexpectedly"
+                break
+            if kind == "progress":
+                progress = payload
+            elif kind == "item":
+                items.append((payload, time.monotonic() - start))
+            elif kind == "timeout":
+                progress = payload
+                break
+            else:
+                status, value = ("ok" if kind == "done" else "error"), payload
+                break
+    finally:
+        if process.is_alive():
+            _kill_group(process)
+        else:
+            process.join()
+        parent_connection.close()
+
+    return {"status": status, "value": value, "items": items, "progress": progress,
+            "elapsed": time.monotonic() - start}
@@ -0,0 +1,53 @@
+import math
+import random
+from typing import List, Optional, Tuple
+
+# Кандидати для збору співвідношень: k_i = start + i * step (mod n), значення
+# base * alpha^(k_i) mod p. Наступне значення — одне множення на alpha^step замість
+# окремого pow(alpha, k, p). Крок береться випадковим і взаємно простим з n: з кроком 1
+# і малим alpha сусідні значення v, alpha*v, ... часто гладкі або негладкі разом.
+
+
+class CandidateStream:
+    """Детермінований потік кандидатів (k, base * alpha^k mod p).
+
+    Однакове seed дає однакові start і step; потоки stream = 0..streams-1
+    беруть індекси i ≡ stream (mod streams), тож вони не перетинаються і
+    разом обходять ту саму послідовність без повторів показників.
+    """
+
+    def __init__(self, alpha: int, p: int, n: int, seed: Optional[int] = None, stream: int = 0, streams: int = 1, base: int = 1):
+        rng = random.Random(random.getrandbits(64) if seed is None else seed)
+        self.alpha = alpha
+        self.p = p
+        self.n = n
+        self.base = base % p
+        self.start = rng.randrange(n)
+        self.step = rng.randrange(1, n) if n > 1 else 1
+        while math.gcd(self.step, n) != 1:
+            self.step = rng.randrange(1, n)
+        self.stream = stream
+        self.streams = streams
+        self.multiplier = pow(alpha, self.step * streams % n, p)
+        self.seek(0)
+
+    def seek(self, position: int) -> None:
+        # position — номер кандидата в межах цього потоку
+        self.position = position
+        self.index = self.stream + position * self.streams
+        self.k = (self.start + self.index * self.step) % self.n
+        self.value = self.base * pow(self.alpha, self.k, self.p) % self.p
+
+    def block(self, size: int) -> Tuple[List[int], List[int]]:
+        ks, values = [0] * size, [0] * size
+        k, value = self.k, self.value
+        k_step = self.step * self.streams % self.n
+        for j in range(size):
+            ks[j] = k
+            values[j] = value
+            k = (k + k_step) % self.n
+            value = value * self.multiplier % self.p
+        self.k, self.value = k, value
+        self.position += size
+        self.index += size * self.streams
+        return ks, values
@@ -0,0 +1,157 @@
+import math
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Tuple
+
+from cancellation import Deadline, check_deadline
+from number_theory import crt, factorize
+from sparse_linalg import DenseSolver, EchelonBasis, SparseRow, solve_sparse_mod
+
+# компоненти q^e з q не більше цієї межі розв'язуються напряму Полігом–Геллманом
+POHLIG_HELLMAN_LIMIT = 1 << 16
+
+
+def pohlig_hellman_logs(alpha: int, p: int, n: int, factor_base: List[int], q: int, e: int, deadline: Optional[Deadline] = None) -> Optional[List[int]]:
+    if math.gcd(alpha, p) != 1:
+        # p не просте (у наборі даних такі трапляються) — лишається лінійна алгебра
+        return None
+    gamma = pow(alpha, n // q, p)
+    table: Dict[int, int] = {}
+    g = 1
+    for d in range(q):
+        table.setdefault(g, d)
+        g = g * gamma % p
+    if len(table) != q:
+        # alpha не породжує q-компоненту групи
+        return None
+
+    alpha_inv = pow(alpha, -1, p)
+    logs = []
+    for h in factor_base:
+        check_deadline(deadline, "linear_algebra", component=q, logs=len(logs))
+        x, qk = 0, 1
+        for k in range(e):
+            h_k = pow(h * pow(alpha_inv, x, p) % p, n // (qk * q), p)
+            d = table.get(h_k)
+            if d is None:
+                return None
+            x += d * qk
+            qk *= q
+        logs.append(x)
+    return logs
+
+
+def solve_mod_prime_power(rows: List[SparseRow], b: List[int], ncols: int, q: int, e: int, dense_solver: DenseSolver, stats: Optional[Dict] = None, deadline: Optional[Deadline] = None) -> Optional[List[int]]:
+    # розв'язок за модулем q, далі підйом Гензеля: x_{i+1} = x_i + q^i * y, A y ≡ (b - A x_i) / q^i (mod q)
+    x = solve_sparse_mod(rows, [v % q for v in b], ncols, q, dense_solver, stats, deadline)
+    if x is None:
+        return None
+    modulus = q
+    for _ in range(1, e):
+        next_modulus = modulus * q
+        residual = []
+        for row, rhs in zip(rows, b):
+            diff = (rhs - sum(v * x[c] for c, v in row.items())) % next_modulus
+            if diff % modulus:
+                return None
+            residual.append(diff // modulus)
+        y = solve_sparse_mod(rows, residual, ncols, q, dense_solver, deadline=deadline)
+        if y is None:
+            return None
+        x = [(xi + modulus * yi) % next_modulus for xi, yi in zip(x, y)]
+        modulus = next_modulus
+    return x
+
+
+class RankTracker:
+    """Ранг системи співвідношень за кожним великим простим дільником q числа n.
+
+    Компоненти з q до POHLIG_HELLMAN_LIMIT розв'язуються без співвідношень, а для
+    q, що не ділить порядок alpha, логарифми не визначаються взагалі — такі компоненти
+    не відстежуються. Для решти кожне нове рівняння одразу зводиться в EchelonBasis.
+    Для складеного p компоненти не зводяться до q-частин — трекер там не застосовується.
+    Якщо хоч одна компонента потребує звичайної лінійної алгебри (alpha не породжує її
+    або q^e з e > 1 вище межі Поліга-Гелмана), трекер теж непридатний: відкинуті ним
+    рівняння знадобляться саме їй.
+    """
+
+    def __init__(self, n: int, ncols: int, alpha: int, p: int):
+        self.ncols = ncols
+        self.seen: set = set()
+        components = factorize(n)
+        self.covered = all(pow(alpha, n // q, p) != 1 and (q <= POHLIG_HELLMAN_LIMIT or e == 1)
+                           for q, e in components.items())
+        self.bases = {q: EchelonBasis(ncols, q) for q in components
+                      if q > POHLIG_HELLMAN_LIMIT and pow(alpha, n // q, p) != 1}
+
+    @property
+    def applicable(self) -> bool:
+        return self.covered and bool(self.bases)
+
+    def add(self, row: SparseRow, k: int) -> bool:
+        # рівняння потрібне, якщо підвищує ранг хоча б за одним модулем
+        accepted = False
+        for basis in self.bases.values():
+            accepted = basis.add(row, k) or accepted
+        if accepted:
+            self.seen.update(row)
+        return accepted
+
+    @property
+    def complete(self) -> bool:
+        # без відстежуваних компонент повнота рангу нічого не гарантує
+        return bool(self.bases) and all(basis.complete for basis in self.bases.values())
+
+    @property
+    def determined(self) -> bool:
+        # визначено логарифми всіх простих, що вже траплялися в співвідношеннях
+        return bool(self.bases) and all(basis.rank == len(self.seen) for basis in self.bases.values())
+
+    def stats(self) -> Dict:
+        return {"rank": {q: basis.rank for q, basis in self.bases.items()},
+                "rejected_relations": max((basis.rejected for basis in self.bases.values()), default=0)}
+
+
+def _solve_component(args) -> Tuple[Optional[List[int]], Dict]:
+    rows, b, ncols, alpha, p, n, factor_base, q, e, dense_solver, deadline, basis = args
+    # pivot_failures — стовпці без оборотного опорного елемента (лишаються нулями),
+    # pohlig_hellman_failed — alpha не породжує q-компоненту, і вона йде в лінійну алгебру
+    stats: Dict = {"q": q, "e": e, "pivot_failures": 0, "pohlig_hellman_failed": False}
+    if q <= POHLIG_HELLMAN_LIMIT:
+        logs = pohlig_hellman_logs(alpha, p, n, factor_base, q, e, deadline)
+        if logs is not None:
+            stats["method"] = "pohlig_hellman"
+            return logs, stats
+        stats["pohlig_hellman_failed"] = True
+    if basis is not None and e == 1 and not basis.inconsistent:
+        # ешелонна форма вже побудована під час збору — лишається зворотна підстановка
+        stats.update(method="echelon", rank=basis.rank, pivot_failures=ncols - basis.rank)
+        return basis.solve(), stats
+    stats["method"] = "linear_algebra"
+    logs = solve_mod_prime_power(rows, b, ncols, q, e, dense_solver, stats, deadline)
+    stats["pivot_failures"] = stats.get("sge_pivot_failures", 0)
+    return logs, stats
+
+
+def solve_logs_crt(rows: List[SparseRow], b: List[int], ncols: int, n: int, alpha: int, p: int, factor_base: List[int], dense_solver: DenseSolver, executor: Optional[Executor] = None, stats: Optional[Dict] = None, deadline: Optional[Deadline] = None, tracker: Optional[RankTracker] = None) -> Optional[List[int]]:
+    components = list(factorize(n).items())
+    bases = tracker.bases if tracker is not None else {}
+    tasks = [(rows, b, ncols, alpha, p, n, factor_base, q, e, dense_solver, deadline, bases.get(q)) for q, e in components]
+    if executor is not None:
+        results = list(executor.map(_solve_component, tasks))
+    else:
+        results = [_solve_component(task) for task in tasks]
+    solutions = [solution for solution, _ in results]
+    if stats is not None:
+        stats["components"] = [{**component_stats, "failed": solution is None} for solution, component_stats in results]
+        stats["failed_components"] = sum(1 for solution in solutions if solution is None)
+        stats["pivot_failures"] = sum(component_stats["pivot_failures"] for _, component_stats in results)
+        stats["pohlig_hellman_failures"] = sum(1 for _, component_stats in results if component_stats["pohlig_hellman_failed"])
+        stats["wiedemann_failed_attempts"] = sum(component_stats.get("wiedemann_failed_attempts", 0) for _, component_stats in results)
+
+    if all(solution is None for solution in solutions):
+        return None
+    # компонента без розв'язку (наприклад, alpha не породжує q-частину групи) заповнюється нулями,
+    # як і невизначені стовпці в gaussian_elimination_mod: остаточну відповідь перевіряє verify_result
+    solutions = [solution if solution is not None else [0] * ncols for solution in solutions]
+    moduli = [q ** e for q, e in components]
+    return [crt([solution[i] for solution in solutions], moduli) for i in range(ncols)]
@@ -0,0 +1,172 @@
+import bisect
+import contextlib
+import csv
+import io
+import json
+import math
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from index_calculus import calculate_factor_base_bound, generate_factor_base, index_calculus, verify_result
+from index_calculus_parallel import index_calculus_parallel
+from autotune import tuned_parameters
+
+try:
+    from index_calculus_uint64 import index_calculus_uint64
+except ImportError:  # без NumPy рушій на uint64 недоступний
+    index_calculus_uint64 = None
+
+INPUT_FILE = "dataset_created_during_the_execution_of_lab#2.csv"
+CALIBRATION_FILE = "dispatcher_calibration.json"
+QUEUE_SIZE = 8
+UINT64_MAX_BITS = 63
+
+
+def candidate_engines() -> List[Tuple[str, int]]:
+    cpus = os.cpu_count() or 1
+    workers = sorted({2, cpus}) if cpus > 1 else []
+    engines = [("serial", 1)] + [(mode, w) for w in workers for mode in ("thread", "process")]
+    if index_calculus_uint64 is not None:
+        engines.append(("uint64", 1))
+    return engines
+
+
+def estimate_work(p: int, c: float = 3.38) -> Dict[str, int]:
+    B = calculate_factor_base_bound(p - 1, c)
+    return {"bits": p.bit_length(), "B": B, "factor_base_size": len(generate_factor_base(B))}
+
+
+# Калібрування — для кожного рушія "mode:workers" список точок {factor_base_size, seconds, runs, verified}:
+# медіанний час і кількість перевірених розв'язків на задачах з такою факторною базою.
+Calibration = Dict[str, List[Dict]]
+
+
+def load_calibration(filename: str = CALIBRATION_FILE) -> Calibration:
+    if not os.path.isfile(filename):
+        return {}
+    with open(filename) as file:
+        # файл старого формату (пороги за бітовою довжиною) ігнорується
+        return json.load(file).get("engines", {})
+
+
+def predicted_seconds(points: List[Dict], t: int) -> float:
+    # лінійна інтерполяція в log-log координатах між найближчими каліброваними розмірами бази,
+    # за межами — продовження крайнього відрізка
+    if len(points) == 1:
+        return points[0]["seconds"]
+    sizes = [point["factor_base_size"] for point in points]
+    i = min(max(bisect.bisect_left(sizes, t), 1), len(points) - 1)
+    (t0, s0), (t1, s1) = ((point["factor_base_size"], max(point["seconds"], 1e-6)) for point in points[i - 1:i + 1])
+    slope = math.log(s1 / s0) / math.log(t1 / t0)
+    return s0 * (max(t, 1) / t0) ** slope
+
+
+def reliability(points: List[Dict], t: int) -> float:
+    # частка перевірених розв'язків у найближчій каліброваній точці
+    point = min(points, key=lambda point: abs(point["factor_base_size"] - t))
+    return point["verified"] / point["runs"] if point["runs"] else 0.0
+
+
+def choose_engine(work: Dict[str, int], calibration: Calibration) -> Tuple[str, int]:
+    fits_uint64 = index_calculus_uint64 is not None and work["bits"] <= UINT64_MAX_BITS
+    t = work["factor_base_size"]
+    serial = calibration.get("serial:1")
+    # без калібрування — послідовна реалізація: вона не платить за запуск пулу,
+    # а решта рушіїв обирається лише за результатами калібрування
+    if not serial:
+        return "serial", 1
+    baseline = reliability(serial, t)
+    best, best_seconds = ("serial", 1), predicted_seconds(serial, t)
+    for engine, points in calibration.items():
+        mode, workers = engine.split(":")
+        if not points or (mode == "uint64" and not fits_uint64):
+            continue
+        # рушій, що розв'язує рідше за послідовний, не обирається навіть тоді, коли він швидший
+        if reliability(points, t) < baseline:
+            continue
+        seconds = predicted_seconds(points, t)
+        if seconds < best_seconds:
+            best, best_seconds = (mode, int(workers)), seconds
+    return best
+
+
+def run_engine(mode: str, workers: int, alpha: int, beta: int, p: int, c: float = 3.38, extra_equations: int = 30) -> Optional[int]:
+    if mode == "serial":
+        return index_calculus(alpha, beta, p - 1, p, c, extra_equations)
+    if mode == "uint64":
+        return index_calculus_uint64(alpha, beta, p - 1, p, c, extra_equations)
+    return index_calculus_parallel(alpha, beta, p - 1, p, QUEUE_SIZE, num_processes=workers, c=c,
+                                   extra_equations=extra_equations, use_threads=(mode == "thread"))
+
+
+def solve(alpha: int, beta: int, p: int, calibration: Optional[Calibration] = None, autotune: bool = False) -> Dict:
+    if calibration is None:
+        calibration = load_calibration()
+    c, extra_equations = tuned_parameters(alpha, p) if autotune else (3.38, 30)
+    work = estimate_work(p, c)
+    mode, workers = choose_engine(work, calibration)
+
+    start = time.time()
+    x = run_engine(mode, workers, alpha, beta, p, c, extra_equations)
+    elapsed = time.time() - start
+    return {"x": x, "mode": mode, "workers": workers, "c": c, "extra_equations": extra_equations,
+            "time_seconds": elapsed, **work}
+
+
+def calibrate(instances: List[Tuple[int, int, int]], repeats: int = 3, filename: str = CALIBRATION_FILE) -> Calibration:
+    # задачі групуються за розміром факторної бази — саме він визначає обсяг роботи
+    runs: Dict[str, Dict[int, List[Tuple[float, bool]]]] = {}
+    for alpha, beta, p in instances:
+        t = estimate_work(p)["factor_base_size"]
+        for mode, workers in candidate_engines():
+            if mode == "uint64" and p.bit_length() > UINT64_MAX_BITS:
+                continue
+            for _ in range(repeats):
+                start = time.time()
+                try:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        x = run_engine(mode, workers, alpha, beta, p)
+                except Exception:
+                    x = None
+                elapsed = time.time() - start
+                # швидкий, але хибний або невдалий розв'язок не повинен вигравати калібрування
+                verified = x is not None and verify_result(alpha, x, beta, p)
+                runs.setdefault(f"{mode}:{workers}", {}).setdefault(t, []).append((elapsed, verified))
+
+    calibration: Calibration = {
+        engine: [{"factor_base_size": t, "seconds": statistics.median(seconds for seconds, _ in results),
+                  "runs": len(results), "verified": sum(1 for _, verified in results if verified)}
+                 for t, results in sorted(by_size.items())]
+        for engine, by_size in runs.items()
+    }
+    with open(filename, "w") as file:
+        json.dump({"cpu_count": os.cpu_count(), "repeats": repeats, "engines": calibration}, file, indent=2)
+    return calibration
+
+
+def load_instances(filename: str = INPUT_FILE) -> List[Tuple[int, int, int]]:
+    with open(filename, newline="") as csvfile:
+        return [(int(row["alpha"]), int(row["beta"]), int(row["p"])) for row in csv.DictReader(csvfile)]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "calibrate":
+        input_file = sys.argv[2] if len(sys.argv) > 2 else INPUT_FILE
+        calibration = calibrate(load_instances(input_file))
+        print(f"Калібрування збережено у {CALIBRATION_FILE}:")
+        for engine, points in calibration.items():
+            runs, verified = sum(point["runs"] for point in points), sum(point["verified"] for point in points)
+            total = sum(point["seconds"] for point in points)
+            print(f"  {engine}: розв'язано {verified} з {runs}, сума медіан {total:.3f} с")
+        sys.exit(0)
+
+    if len(sys.argv) != 4:
+        print("Usage: python dispatcher.py <alpha> <beta> <p>")
+        print("       python dispatcher.py calibrate [input.csv]")
+        sys.exit(1)
+
+    result = solve(int(sys.argv[1]), int(sys.argv[2]), int(sys.argv[3]))
+    print(json.dumps(result, ensure_ascii=False))
@@ -0,0 +1,334 @@
+import json
+import multiprocessing as mp
+import os
+import random
+import socket
+import socketserver
+import sys
+import threading
+import time
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple
+
+from index_calculus import (calculate_factor_base_bound, gaussian_elimination_mod, generate_factor_base,
+                            individual_logarithm, verify_result)
+from candidates import CandidateStream
+from cancellation import Deadline, check_deadline
+from crt_linalg import solve_logs_crt
+from relation_log import RelationLog
+from smoothness import BatchSmoothnessTester
+from sparse_linalg import SparseRow
+
+# Протокол — рядки JSON поверх TCP:
+#   воркер -> {"type": "hello", "name": ...}           координатор -> {"type": "job", alpha, p, n, seed, factor_base}
+#   воркер -> {"type": "lease"}                          координатор -> {"type": "range", lease, start, count} | {"type": "done"}
+#   воркер -> {"type": "result", lease, tested, relations: [[k, [[стовпець, показник], ...]], ...]}
+#            координатор відповідає так само, як на "lease"
+# Першим має бути "hello": на інші повідомлення до нього координатор відповідає {"type": "error"}
+# і закриває з'єднання. Некоректний "result" відкидається цілком і лічиться в rejected.
+# Оренда — відрізок [start, start + count) номерів кандидатів спільного CandidateStream(seed),
+# тож воркери не дублюють показників k. Оренда
+# від'єднаного або мовчазного воркера повертається в чергу й видається іншому.
+
+LEASE_SIZE = 2048
+LEASE_SECONDS = 60.0
+BLOCK_SIZE = 128
+
+
+class Coordinator:
+    """Координатор розподіленого збору співвідношень для однієї задачі.
+
+    Роздає воркерам факторну базу й неперетинні відрізки показників, збирає
+    знайдені співвідношення (без повторів) до потрібної кількості. Воркери
+    можуть під'єднуватися й від'єднуватися будь-коли; кожне надіслане ними
+    співвідношення перевіряється, а хибні відкидаються й лічаться в rejected.
+    """
+
+    def __init__(self, alpha: int, p: int, n: int, factor_base: List[int], needed: int, host: str = "127.0.0.1", port: int = 0, lease_size: int = LEASE_SIZE, lease_seconds: float = LEASE_SECONDS, relation_log: Optional[RelationLog] = None):
+        self.job = {"type": "job", "alpha": alpha, "p": p, "n": n, "seed": random.getrandbits(64),
+                    "factor_base": factor_base}
+        self.alpha, self.p, self.n = alpha, p, n
+        self.factor_base = factor_base
+        self.needed = needed
+        self.lease_size = lease_size
+        self.lease_seconds = lease_seconds
+        self.log = relation_log.open(p, alpha, factor_base, n) if relation_log is not None else None
+        self.rows: List[SparseRow] = self.log.rows if self.log is not None else []
+        self.b: List[int] = self.log.b if self.log is not None else []
+        self._seen = set(self.b)
+        self._lock = threading.Lock()
+        self._enough = threading.Event()
+        self._next_start = 0
+        self._leases: Dict[int, Tuple[int, int, str, float]] = {}
+        self._returned: List[Tuple[int, int]] = []
+        self._lease_counter = 0
+        self.candidates_tested = 0
+        self.rejected = 0
+        self.workers: Dict[str, Dict[str, int]] = {}
+        if len(self.rows) >= needed:
+            self._enough.set()
+
+        coordinator = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                coordinator._serve(self.rfile, self.wfile)
+
+        self.server = socketserver.ThreadingTCPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.address = self.server.server_address
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "Coordinator":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._enough.set()
+        self.server.shutdown()
+        self.server.server_close()
+        if self.log is not None:
+            self.log.close()
+
+    def _lease(self, name: str) -> Dict:
+        with self._lock:
+            if self._enough.is_set():
+                return {"type": "done"}
+            now = time.monotonic()
+            for lease_id, (start, count, owner, issued) in list(self._leases.items()):
+                if now - issued > self.lease_seconds:
+                    del self._leases[lease_id]
+                    self._returned.append((start, count))
+            if self._returned:
+                start, count = self._returned.pop()
+            else:
+                start, count = self._next_start, self.lease_size
+                self._next_start += count
+            self._lease_counter += 1
+            self._leases[self._lease_counter] = (start, count, name, now)
+            return {"type": "range", "lease": self._lease_counter, "start": start, "count": count}
+
+    def _valid(self, k, sparse_row) -> bool:
+        # воркер може бути несправним або чужим: рівняння приймається, лише якщо
+        # стовпці й показники коректні та alpha^k ≡ ∏ q^e (mod p)
+        if not isinstance(sparse_row, list):
+            return False
+        value, cols = 1, set()
+        for entry in sparse_row:
+            if not (isinstance(entry, list) and len(entry) == 2 and all(type(x) is int for x in entry)):
+                return False
+            col, e = entry
+            if not 0 <= col < len(self.factor_base) or e <= 0 or col in cols:
+                return False
+            cols.add(col)
+            value = value * pow(self.factor_base[col], e, self.p) % self.p
+        return value == pow(self.alpha, k, self.p)
+
+    def _parse_result(self, message: Dict) -> Tuple[int, int, List[list]]:
+        # структура перевіряється до зміни стану, щоб хибне повідомлення не зарахувалося частково
+        lease, tested, relations = message["lease"], message["tested"], message["relations"]
+        if type(lease) is not int or type(tested) is not int or tested < 0 or not isinstance(relations, list):
+            raise ValueError("malformed result")
+        if not all(isinstance(relation, list) and len(relation) == 2 for relation in relations):
+            raise ValueError("malformed relation")
+        return lease, tested, relations
+
+    def _stats(self, name: str) -> Dict[str, int]:
+        return self.workers.setdefault(name, {"candidates": 0, "relations": 0, "rejected": 0})
+
+    def _reject(self, name: str) -> None:
+        with self._lock:
+            self.rejected += 1
+            self._stats(name)["rejected"] += 1
+
+    def _accept(self, name: str, lease: int, tested: int, relations: List[list]) -> None:
+        with self._lock:
+            self._leases.pop(lease, None)
+            self.candidates_tested += tested
+            stats = self._stats(name)
+            stats["candidates"] += tested
+            for k, sparse_row in relations:
+                if len(self.rows) >= self.needed:
+                    break
+                if type(k) is not int or not self._valid(k % self.n, sparse_row):
+                    self.rejected += 1
+                    stats["rejected"] += 1
+                    continue
+                k %= self.n
+                if k in self._seen:
+                    continue
+                self._seen.add(k)
+                row = {col: e % self.n for col, e in sparse_row}
+                if self.log is not None:
+                    self.log.add(row, k)
+                else:
+                    self.rows.append(row)
+                    self.b.append(k)
+                stats["relations"] += 1
+            if len(self.rows) >= self.needed:
+                self._enough.set()
+
+    def _release(self, name: str) -> None:
+        # воркер пішов: його незавершені оренди видаються іншим
+        with self._lock:
+            for lease_id, (start, count, owner, _) in list(self._leases.items()):
+                if owner == name:
+                    del self._leases[lease_id]
+                    self._returned.append((start, count))
+
+    def _serve(self, rfile, wfile) -> None:
+        name = None
+        try:
+            for line in rfile:
+                message = json.loads(line)
+                kind = message.get("type") if isinstance(message, dict) else None
+                if kind == "hello":
+                    name = f"{message.get('name', 'worker')}@{id(rfile):x}"
+                    reply = self.job
+                elif name is None:
+                    # без "hello" воркер невідомий: ні оренд, ні результатів від нього не приймається
+                    reply = {"type": "error", "reason": "hello required"}
+                elif kind == "result":
+                    try:
+                        self._accept(name, *self._parse_result(message))
+                    except (TypeError, ValueError, KeyError):
+                        self._reject(name)
+                    reply = self._lease(name)
+                else:
+                    reply = self._lease(name)
+                wfile.write((json.dumps(reply) + "\n").encode())
+                wfile.flush()
+                if reply["type"] in ("done", "error"):
+                    break
+        except (ConnectionError, ValueError, KeyError):
+            pass
+        finally:
+            if name is not None:
+                self._release(name)
+
+    def wait(self, deadline: Optional[Deadline] = None, workers_alive: Optional[Callable[[], bool]] = None) -> Tuple[List[SparseRow], List[int]]:
+        while not self._enough.wait(0.2):
+            if workers_alive is not None and not workers_alive():
+                raise RuntimeError(f"усі воркери завершили роботу, зібрано {len(self.rows)} з {self.needed} рівнянь")
+            check_deadline(deadline, "relation_collection", relations=len(self.rows), needed=self.needed,
+                           candidates_tested=self.candidates_tested, workers=len(self.workers))
+        with self._lock:
+            return list(self.rows), list(self.b)
+
+
+def scan_range(candidates: CandidateStream, tester: BatchSmoothnessTester, column: Dict[int, int], start: int, count: int) -> List[list]:
+    relations = []
+    candidates.seek(start)
+    for block_start in range(0, count, BLOCK_SIZE):
+        ks, vals = candidates.block(min(BLOCK_SIZE, count - block_start))
+        for k, factorization in zip(ks, tester.factor_batch(vals)):
+            if factorization:
+                relations.append([k, [[column[q], e] for q, e in factorization.items()]])
+    return relations
+
+
+def run_worker(host: str, port: int, name: Optional[str] = None, max_leases: Optional[int] = None) -> int:
+    """Вузол-воркер: під'єднується до координатора й обробляє оренди, доки той не скаже "done"."""
+    leases = 0
+    with socket.create_connection((host, port)) as connection:
+        stream = connection.makefile("rwb")
+
+        def request(message: Dict) -> Dict:
+            stream.write((json.dumps(message) + "\n").encode())
+            stream.flush()
+            line = stream.readline()
+            return json.loads(line) if line else {"type": "done"}
+
+        job = request({"type": "hello", "name": name or f"{socket.gethostname()}:{os.getpid()}"})
+        if job["type"] != "job":
+            return 0
+        factor_base = job["factor_base"]
+        candidates = CandidateStream(job["alpha"], job["p"], job["n"], job["seed"])
+        tester = BatchSmoothnessTester(factor_base)
+        column = {q: i for i, q in enumerate(factor_base)}
+
+        reply = request({"type": "lease"})
+        while reply["type"] == "range":
+            relations = scan_range(candidates, tester, column, reply["start"], reply["count"])
+            leases += 1
+            reply = request({"type": "result", "lease": reply["lease"], "tested": reply["count"],
+                             "relations": relations})
+            if max_leases is not None and leases >= max_leases:
+                # вихід посеред роботи: щойно видана оренда повернеться координатору
+                break
+    return leases
+
+
+def collect_relations_distributed(alpha: int, n: int, p: int, factor_base: List[int], needed: int, workers: int = 2, host: str = "127.0.0.1", port: int = 0, relation_log: Optional[RelationLog] = None, deadline: Optional[Deadline] = None) -> Tuple[List[SparseRow], List[int]]:
+    # локальні процеси заміняють окремі вузли; зовнішні воркери можуть під'єднатися до того ж порту
+    with Coordinator(alpha, p, n, factor_base, needed, host, port, relation_log=relation_log) as coordinator:
+        print(f"Координатор слухає {coordinator.address[0]}:{coordinator.address[1]}")
+        processes = [mp.Process(target=run_worker, args=(*coordinator.address, f"local-{i}"), daemon=True)
+                     for i in range(workers)]
+        for process in processes:
+            process.start()
+        try:
+            alive = (lambda: any(process.is_alive() for process in processes)) if processes else None
+            A, b = coordinator.wait(deadline, alive)
+        finally:
+            for process in processes:
+                process.join(1.0)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+        for name, stats in coordinator.workers.items():
+            print(f"  {name}: {stats['candidates']} кандидатів, {stats['relations']} рівнянь, "
+                  f"відхилено {stats['rejected']}")
+    return A, b
+
+
+def run_local(alpha: int, beta: int, n: int, p: int, workers: int = 2, c: float = 3.38, extra_equations: int = 30, relation_log: Optional[RelationLog] = None, deadline: Optional[Deadline] = None) -> Optional[int]:
+    factor_base = generate_factor_base(calculate_factor_base_bound(n, c))
+    t = len(factor_base)
+    print(f"Факторна база розміром {t}: {factor_base[:10]}{'...' if t > 10 else ''}")
+
+    A, b = collect_relations_distributed(alpha, n, p, factor_base, t + extra_equations, workers,
+                                         relation_log=relation_log, deadline=deadline)
+    print(f"Зібрано {len(A)} рівнянь")
+
+    logs = solve_logs_crt(A, b, t, n, alpha, p, factor_base, dense_solver=partial(gaussian_elimination_mod, deadline=deadline),
+                          deadline=deadline)
+    if logs is None:
+        print("Система не має розв’язку")
+        return None
+    return individual_logarithm(alpha, beta, n, p, factor_base, logs, deadline=deadline)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 4 and sys.argv[1] == "worker":
+        print(f"Оброблено оренд: {run_worker(sys.argv[2], int(sys.argv[3]))}")
+        sys.exit(0)
+
+    if len(sys.argv) not in (5, 6, 7) or sys.argv[1] not in ("local", "coordinator"):
+        print("Usage: python distributed.py local <alpha> <beta> <p> [workers]")
+        print("       python distributed.py coordinator <alpha> <beta> <p> [port] [local workers]")
+        print("       python distributed.py worker <host> <port>")
+        sys.exit(1)
+
+    alpha, beta, p = int(sys.argv[2]), int(sys.argv[3]), int(sys.argv[4])
+    n = p - 1
+    start = time.time()
+    if sys.argv[1] == "local":
+        x = run_local(alpha, beta, n, p, workers=int(sys.argv[5]) if len(sys.argv) > 5 else 2)
+    else:
+        # координатор слухає на всіх інтерфейсах; воркери на інших машинах запускаються командою worker
+        factor_base = generate_factor_base(calculate_factor_base_bound(n))
+        A, b = collect_relations_distributed(alpha, n, p, factor_base, len(factor_base) + 30,
+                                             workers=int(sys.argv[6]) if len(sys.argv) > 6 else 0,
+                                             host="0.0.0.0", port=int(sys.argv[5]) if len(sys.argv) > 5 else 5555)
+        logs = solve_logs_crt(A, b, len(factor_base), n, alpha, p, factor_base, dense_solver=gaussian_elimination_mod)
+        x = individual_logarithm(alpha, beta, n, p, factor_base, logs) if logs is not None else None
+
+    if x is not None and verify_result(alpha, x, beta, p):
+        print(f"\nЗнайдено x = {x}")
+    else:
+        print("Алгоритм не знайшов розв’язку")
+    print(f"\nЧас виконання: {time.time() - start:.2f} с")
@@ -0,0 +1,94 @@
+import argparse
+import contextlib
+import csv
+import io
+import json
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from index_calculus import calculate_factor_base_bound, collect_relations, gaussian_elimination_mod, generate_factor_base
+from number_theory import factorize
+from vectorized import gaussian_elimination_numpy, gaussian_elimination_uint64, supports
+
+INPUT_FILE = "dataset_created_during_the_execution_of_lab#2.csv"
+OUTPUT_FILE = "elimination_benchmark_results.json"
+EXTRA_EQUATIONS = 30
+
+Solver = Callable[[List[List[int]], List[int], int], Optional[List[int]]]
+
+SOLVERS: Dict[str, Solver] = {
+    "python": gaussian_elimination_mod,
+    "numpy": gaussian_elimination_numpy,
+    "uint64": gaussian_elimination_uint64,
+}
+
+
+def relation_system(alpha: int, p: int, seed: int) -> Tuple[List[List[int]], List[int], int]:
+    # щільна система з t + EXTRA_EQUATIONS рівнянь, як її отримує розв'язувач
+    n = p - 1
+    factor_base = generate_factor_base(calculate_factor_base_bound(n))
+    with contextlib.redirect_stdout(io.StringIO()):
+        rows, b = collect_relations(alpha, n, p, factor_base, len(factor_base) + EXTRA_EQUATIONS, seed=seed)
+    A = [[row.get(col, 0) for col in range(len(factor_base))] for row in rows]
+    return A, b, len(factor_base)
+
+
+def best_time(solver: Solver, A: List[List[int]], b: List[int], mod: int, repeats: int) -> Tuple[float, Optional[List[int]]]:
+    times, result = [], None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = solver(A, b, mod)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def run(input_file: str, repeats: int, seed: int, max_p: Optional[int]) -> Dict:
+    with open(input_file, newline="") as csvfile:
+        pairs = list(dict.fromkeys((int(row["p"]), int(row["alpha"])) for row in csv.DictReader(csvfile)))
+    if max_p is not None:
+        pairs = [(p, alpha) for p, alpha in pairs if p <= max_p]
+
+    records = []
+    totals: Dict[str, float] = {name: 0.0 for name in SOLVERS}
+    mismatches = 0
+    for p, alpha in pairs:
+        A, b, t = relation_system(alpha, p, seed)
+        if not A:
+            continue
+        n = p - 1
+        # модуль n (як у паралельній реалізації) і найбільший простий дільник n (як у CRT)
+        for kind, mod in (("n", n), ("q", max(factorize(n)))):
+            timings = {}
+            reference = None
+            for name, solver in SOLVERS.items():
+                if name == "uint64" and not supports(mod):
+                    continue
+                seconds, result = best_time(solver, A, b, mod, repeats)
+                timings[name] = seconds
+                totals[name] += seconds
+                if name == "python":
+                    reference = result
+                elif result != reference:
+                    print(f"[{p}] {name}: розв'язок за модулем {mod} відрізняється від gaussian_elimination_mod")
+                    mismatches += 1
+            records.append({"p": p, "alpha": alpha, "rows": len(A), "cols": t, "modulus": kind, "mod": mod, "seconds": timings})
+            speedups = ", ".join(f"{name} {timings['python'] / seconds:.1f}x" for name, seconds in timings.items() if name != "python")
+            print(f"[{p}] {len(A)}x{t} mod {kind} = {mod}: python {timings['python']:.4f} с; {speedups}")
+    return {"repeats": repeats, "seed": seed, "mismatches": mismatches, "totals": totals, "systems": records}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Порівняння щільних розв'язувачів систем за модулем на системах датасету")
+    parser.add_argument("--input", default=INPUT_FILE)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument("--max-p", type=int, default=None)
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    args = parser.parse_args()
+
+    report = run(args.input, args.repeats, args.seed, args.max_p)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    totals = report["totals"]
+    print("Сумарний час: " + ", ".join(f"{name} {seconds:.3f} с" for name, seconds in totals.items()))
+    print(f"Розбіжностей: {report['mismatches']}")
@@ -0,0 +1,74 @@
+import json
+import os
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+CACHE_DIR = "factor_base_logs"
+
+FactorBaseLogs = Tuple[List[int], List[int]]
+
+
+class FactorBaseLogCache:
+    """Кеш розв'язаних логарифмів факторної бази для (p, alpha, n, B).
+
+    Тримає останні max_entries таблиць у пам'яті (LRU) і кожну таблицю
+    додатково зберігає на диск у directory, тож повторний запуск з тими ж
+    p та alpha виконує лише етап пошуку індивідуального логарифма. Логарифми
+    визначені за модулем n, тож таблиці для різних n не змішуються.
+    """
+
+    def __init__(self, directory: Optional[str] = CACHE_DIR, max_entries: int = 32):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[Tuple[int, int, int, int], FactorBaseLogs]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, p: int, alpha: int, n: int, B: int) -> str:
+        return os.path.join(self.directory, f"{p}_{alpha}_{n}_{B}.json")
+
+    def _remember(self, key: Tuple[int, int, int, int], entry: FactorBaseLogs) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, p: int, alpha: int, n: int, B: int) -> Optional[FactorBaseLogs]:
+        key = (p, alpha, n, B)
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+
+        if self.directory is not None:
+            path = self._path(p, alpha, n, B)
+            if os.path.isfile(path):
+                with open(path) as file:
+                    data = json.load(file)
+                entry = (data["factor_base"], data["logs"])
+                self._remember(key, entry)
+                self.hits += 1
+                return entry
+
+        self.misses += 1
+        return None
+
+    def put(self, p: int, alpha: int, n: int, B: int, factor_base: List[int], logs: List[int]) -> None:
+        entry = (list(factor_base), list(logs))
+        self._remember((p, alpha, n, B), entry)
+
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(p, alpha, n, B)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w") as file:
+                json.dump({"p": p, "alpha": alpha, "n": n, "B": B,
+                           "factor_base": entry[0], "logs": entry[1]}, file)
+            os.replace(tmp_path, path)
+
+    def discard(self, p: int, alpha: int, n: int, B: int) -> None:
+        self._memory.pop((p, alpha, n, B), None)
+        if self.directory is not None:
+            path = self._path(p, alpha, n, B)
+            if os.path.isfile(path):
+                os.remove(path)
@@ -0,0 +1,41 @@
+import glob
+import importlib
+import os
+import sys
+
+# Кожен модуль дерева (бібліотеки й точки входу) має імпортуватися з чистої копії репозиторію.
+# Відсутні сторонні залежності (pandas, matplotlib тощо) не вважаються помилкою.
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def local_modules() -> list:
+    names = [os.path.splitext(os.path.basename(path))[0] for path in glob.glob(os.path.join(ROOT, "*.py"))]
+    # index-calculus.py — лише обгортка для запуску з командного рядка, її ім'я не імпортується
+    return sorted(name for name in names if name.isidentifier())
+
+
+def main() -> int:
+    sys.path.insert(0, ROOT)
+    modules = local_modules()
+    failures, skipped = 0, 0
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            if e.name is not None and e.name not in modules:
+                print(f"{name}: пропущено, немає залежності {e.name}")
+                skipped += 1
+                continue
+            print(f"{name}: {e!r}")
+            failures += 1
+        except Exception as e:
+            print(f"{name}: {e!r}")
+            failures += 1
+    print(f"Імпортовано модулів: {len(modules) - failures - skipped} з {len(modules)}, "
+          f"пропущено: {skipped}, помилок: {failures}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
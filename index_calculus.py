@@ -0,0 +1,358 @@
+import math
+import time
+import sys
+from functools import partial
+from typing import Callable, List, Dict, Optional, Iterable, Iterator
+from factor_base_log_cache import FactorBaseLogCache
+from smoothness import BatchSmoothnessTester, StagedSmoothnessTester, trial_factorization
+from prime_sieve import primes_up_to
+from sparse_linalg import SparseRow
+from crt_linalg import RankTracker, solve_logs_crt
+from number_theory import is_probable_prime
+from instrumentation import Observer, phase
+from large_primes import LargePrimeCombiner
+from cancellation import Deadline, check_deadline
+from relation_log import RelationLog, RelationLogFile
+from candidates import CandidateStream
+
+try:
+    from vectorized import VectorizedDescent, gaussian_elimination_numpy, supports as vectorized_supports
+except ImportError:  # без NumPy спуск виконується пакетною перевіркою на цілих Python
+    VectorizedDescent = None
+    gaussian_elimination_numpy = None
+
+SMOOTHNESS_BLOCK_SIZE = 128
+LARGE_PRIME_FACTOR = 100
+# з відстеженням рангу збір може тривати довше за needed, але не більше ніж у стільки разів
+RANK_RELATION_LIMIT = 2
+
+RelationCollector = Callable[..., tuple[List[SparseRow], List[int]]]
+
+
+def generate_factor_base(B: int) -> List[int]:
+    return primes_up_to(B).tolist()
+
+def calculate_factor_base_bound(n: int, c: float = 3.38) -> int:
+    log_n = math.log(n)
+    log_log_n = math.log(log_n)
+    B = c * math.exp(0.5 * math.sqrt(log_n * log_log_n))
+    return int(B)
+
+def mod_inverse(a: int, m: int) -> int:
+    try:
+        return pow(a, -1, m)
+    except ValueError:
+        raise ValueError(f"mod_inverse: {a} has no inverse mod {m}")
+
+def gaussian_elimination_mod(A: List[List[int]], b: List[int], mod: int, deadline: Optional[Deadline] = None) -> Optional[List[int]]:
+    n = len(A)
+    m = len(A[0])
+    A = [row[:] for row in A]
+    b = b[:]
+
+    for col in range(m):
+        check_deadline(deadline, "linear_algebra", column=col, columns=m)
+        pivot_row = None
+        for row in range(col, n):
+            if A[row][col] % mod != 0:
+                try:
+                    mod_inverse(A[row][col], mod)
+                    pivot_row = row
+                    break
+                except ValueError:
+                    continue
+        if pivot_row is None:
+            continue
+        if pivot_row != col:
+            A[col], A[pivot_row] = A[pivot_row], A[col]
+            b[col], b[pivot_row] = b[pivot_row], b[col]
+        inv = mod_inverse(A[col][col], mod)
+        for j in range(m):
+            A[col][j] = (A[col][j] * inv) % mod
+        b[col] = (b[col] * inv) % mod
+        for row in range(n):
+            if row != col and A[row][col] != 0:
+                factor = A[row][col]
+                for j in range(m):
+                    A[row][j] = (A[row][j] - factor * A[col][j]) % mod
+                b[row] = (b[row] - factor * b[col]) % mod
+
+    solution = [0] * m
+    for row in range(n):
+        leading_col = next((i for i, val in enumerate(A[row]) if val != 0), None)
+        if leading_col is None:
+            if b[row] % mod != 0:
+                return None
+        else:
+            solution[leading_col] = b[row] % mod
+    return solution
+
+def verify_result(alpha: int, x: int, beta: int, p: int) -> bool:
+    return pow(alpha, x, p) == beta % p
+
+def enough_relations(accepted: int, found: int, needed: int, rank_tracker: Optional[RankTracker] = None) -> bool:
+    if rank_tracker is None:
+        return accepted >= needed
+    # зупинка на повному ранзі; після needed знайдених рівнянь — щойно визначено логарифми
+    # всіх простих, що траплялися: найрідші великі прості бази можуть чекати на рівняння довго
+    return (rank_tracker.complete or (found >= needed and rank_tracker.determined)
+            or found >= RANK_RELATION_LIMIT * needed)
+
+def collect_relations(alpha: int, n: int, p: int, factor_base: List[int], needed: int, block_size: int = SMOOTHNESS_BLOCK_SIZE, counters: Optional[Dict] = None, large_primes: int = 0, deadline: Optional[Deadline] = None, relation_log: Optional[RelationLog] = None, seed: Optional[int] = None, rank_tracker: Optional[RankTracker] = None, staged_smoothness: bool = False) -> tuple[List[SparseRow], List[int]]:
+    if relation_log is not None:
+        with relation_log.open(p, alpha, factor_base, n) as log:
+            if log.loaded:
+                print(f"З журналу відновлено {log.loaded} рівнянь")
+            return _collect_relations(alpha, n, p, factor_base, needed, block_size, counters, large_primes, deadline, seed, rank_tracker, staged_smoothness, log)
+    return _collect_relations(alpha, n, p, factor_base, needed, block_size, counters, large_primes, deadline, seed, rank_tracker, staged_smoothness)
+
+def _collect_relations(alpha: int, n: int, p: int, factor_base: List[int], needed: int, block_size: int, counters: Optional[Dict], large_primes: int, deadline: Optional[Deadline], seed: Optional[int], rank_tracker: Optional[RankTracker] = None, staged_smoothness: bool = False, log: Optional[RelationLogFile] = None) -> tuple[List[SparseRow], List[int]]:
+    # поетапний тест не повертає кофакторів, тож для великих простих лишається пакетний
+    tester = StagedSmoothnessTester(factor_base, p) if staged_smoothness and not large_primes else BatchSmoothnessTester(factor_base)
+    stream = CandidateStream(alpha, p, n, seed)
+    column = {p_: i for i, p_ in enumerate(factor_base)}
+    combiner = None
+    if large_primes:
+        B = factor_base[-1]
+        combiner = LargePrimeCombiner(n, B, min(B * B, LARGE_PRIME_FACTOR * B), double=(large_primes == 2))
+    # журнал сам відкидає повтори й одразу зберігає кожне нове рівняння на диск
+    A, b = (log.rows, log.b) if log is not None else ([], [])
+    if rank_tracker is not None:
+        for row, k in zip(A, b):
+            rank_tracker.add(row, k)
+
+    found = [len(A)]
+
+    def enough() -> bool:
+        return enough_relations(len(A), found[0], needed, rank_tracker)
+
+    def add_relation(row: SparseRow, k: int) -> None:
+        if rank_tracker is not None:
+            found[0] += 1
+            if not rank_tracker.add(row, k % n):
+                # лінійно залежне рівняння не підвищує ранг жодної компоненти
+                return
+        if log is not None:
+            if not log.add(row, k):
+                return
+        else:
+            A.append(row)
+            b.append(k % n)
+        if len(A) % 10 == 0:
+            print(f"Зібрано {len(A)} рівнянь")
+
+    while not enough():
+        check_deadline(deadline, "relation_collection", relations=len(A), needed=needed, candidates_tested=tester.tested)
+        ks, vals = stream.block(block_size)
+        if combiner is None:
+            for k, factorization in zip(ks, tester.factor_batch(vals)):
+                if factorization:
+                    add_relation({column[p_]: e % n for p_, e in factorization.items()}, k)
+                    if enough():
+                        break
+            continue
+
+        for k, partial in zip(ks, tester.factor_batch_with_cofactor(vals, combiner.cofactor_bound())):
+            if partial is None or partial[0] is None:
+                continue
+            factorization, cofactor = partial
+            row = {column[p_]: e for p_, e in factorization.items()}
+            if cofactor == 1:
+                if row:
+                    add_relation({c: e % n for c, e in row.items()}, k)
+            else:
+                for combined_row, combined_k in combiner.add(k, row, cofactor):
+                    add_relation(combined_row, combined_k)
+            if enough():
+                break
+
+    if counters is not None:
+        counters.update(candidates_tested=tester.tested, smooth_candidates=tester.smooth, relations=len(A))
+        if isinstance(tester, StagedSmoothnessTester):
+            counters["rejections"] = dict(tester.rejections)
+        if log is not None:
+            counters["resumed_relations"] = log.loaded
+        if combiner is not None:
+            counters.update(partial_relations=combiner.partials, combined_relations=combiner.combined)
+        if rank_tracker is not None:
+            counters.update(rank_tracker.stats())
+    return A, b
+
+def solve_factor_base_logs(alpha: int, n: int, p: int, c: float = 3.38, extra_equations: int = 30, cache: Optional[FactorBaseLogCache] = None, observer: Optional[Observer] = None, large_primes: int = 0, deadline: Optional[Deadline] = None, relation_log: Optional[RelationLog] = None, rank_tracking: bool = True, staged_smoothness: bool = False, collector: Optional[RelationCollector] = None) -> Optional[tuple[List[int], List[int]]]:
+    # collector заміняє послідовний збір (наприклад, пулом IndexCalculusSession); він отримує
+    # (alpha, n, p, factor_base, needed) та іменовані counters, deadline і rank_tracker
+    B = calculate_factor_base_bound(n, c)
+    if cache is not None:
+        cached = cache.get(p, alpha, n, B)
+        if cached is not None:
+            print(f"Логарифми факторної бази взято з кешу (B = {B})")
+            return cached
+
+    with phase(observer, "factor_base") as counters:
+        factor_base = generate_factor_base(B)
+        t = len(factor_base)
+        counters.update(B=B, factor_base_size=t)
+    print(f"Факторна база розміром {t}: {factor_base[:10]}{'...' if t > 10 else ''}")
+
+    with phase(observer, "relation_collection") as counters:
+        start = time.perf_counter()
+        tracker = RankTracker(n, t, alpha, p) if rank_tracking and is_probable_prime(p) else None
+        if tracker is not None and not tracker.applicable:
+            tracker = None
+        if collector is None:
+            collector = partial(collect_relations, large_primes=large_primes, relation_log=relation_log, staged_smoothness=staged_smoothness)
+        A, b = collector(alpha, n, p, factor_base, t + extra_equations, counters=counters, deadline=deadline, rank_tracker=tracker)
+        elapsed = time.perf_counter() - start
+        tested = counters["candidates_tested"]
+        counters["smooth_hit_rate"] = counters["smooth_candidates"] / tested if tested else 0.0
+        counters["relations_per_second"] = len(A) / elapsed if elapsed else 0.0
+
+    with phase(observer, "linear_algebra") as counters:
+        counters.update(rows=len(A), cols=t, nnz=sum(len(row) for row in A))
+        # векторизоване виключення дає той самий розв'язок, що й gaussian_elimination_mod
+        dense_solver = gaussian_elimination_numpy if gaussian_elimination_numpy is not None else gaussian_elimination_mod
+        logs = solve_logs_crt(A, b, t, n, alpha, p, factor_base, dense_solver=partial(dense_solver, deadline=deadline),
+                              stats=counters, deadline=deadline, tracker=tracker)
+    if logs is None:
+        print("Система не має розв’язку")
+        return None
+
+    print("Отримані логарифми факторної бази:")
+    for p_, log in zip(factor_base, logs):
+        print(f"log_{alpha}({p_}) ≡ {log} (mod {n})")
+
+    if cache is not None:
+        cache.put(p, alpha, n, B, factor_base, logs)
+    return factor_base, logs
+
+def individual_logarithm(alpha: int, beta: int, n: int, p: int, factor_base: List[int], logs: List[int], attempts: int = 1000, block_size: int = SMOOTHNESS_BLOCK_SIZE, observer: Optional[Observer] = None, deadline: Optional[Deadline] = None) -> Optional[int]:
+    if VectorizedDescent is not None and vectorized_supports(p):
+        with phase(observer, "descent") as counters:
+            descent = VectorizedDescent(factor_base, logs, n)
+            x = descent.solve(alpha, beta, p, attempts, deadline=deadline)
+            counters.update(attempts=descent.tested, smooth_candidates=descent.smooth,
+                            hit_rate=descent.smooth / descent.tested if descent.tested else 0.0,
+                            solved=x is not None, vectorized=True)
+        return x
+
+    tester = BatchSmoothnessTester(factor_base)
+    stream = CandidateStream(alpha, p, n, base=beta)
+    with phase(observer, "descent") as counters:
+        x = None
+        for start in range(0, attempts, block_size):
+            check_deadline(deadline, "descent", attempts=start)
+            ls, vals = stream.block(min(block_size, attempts - start))
+            for l, factorization in zip(ls, tester.factor_batch(vals)):
+                if factorization:
+                    result = -l
+                    for i, p_ in enumerate(factor_base):
+                        result += logs[i] * factorization.get(p_, 0)
+                    if verify_result(alpha, result % n, beta, p):
+                        x = result % n
+                        break
+            if x is not None:
+                break
+        counters.update(attempts=tester.tested, smooth_candidates=tester.smooth,
+                        hit_rate=tester.smooth / tester.tested if tester.tested else 0.0, solved=x is not None)
+    return x
+
+def index_calculus_many(alpha: int, betas: Iterable[int], n: int, p: int, c: float = 3.38, extra_equations: int = 30, cache: Optional[FactorBaseLogCache] = None, attempts: int = 1000, observer: Optional[Observer] = None, large_primes: int = 0, deadline: Optional[Deadline] = None, relation_log: Optional[RelationLog] = None, rank_tracking: bool = True, staged_smoothness: bool = False) -> Iterator[tuple[int, Optional[int]]]:
+    pending = list(dict.fromkeys(beta % p for beta in betas))
+    if not pending:
+        return
+
+    solved = solve_factor_base_logs(alpha, n, p, c, extra_equations, cache, observer, large_primes, deadline, relation_log, rank_tracking, staged_smoothness)
+    if solved is None:
+        for beta in pending:
+            yield beta, None
+        return
+    factor_base, logs = solved
+
+    # спільні показники l для всіх β: alpha^l обчислюється один раз на спробу,
+    # а кандидати beta * alpha^l перевіряються на гладкість одним пакетом
+    tester = BatchSmoothnessTester(factor_base)
+    stream = CandidateStream(alpha, p, n)
+    solved_count = 0
+    descent_start = time.perf_counter()
+    for attempt in range(attempts):
+        if not pending:
+            break
+        check_deadline(deadline, "descent", attempts=attempt, unsolved=len(pending))
+        (l,), (alpha_l,) = stream.block(1)
+        factorizations = tester.factor_batch([(beta * alpha_l) % p for beta in pending])
+        still_pending = []
+        for beta, factorization in zip(pending, factorizations):
+            x = None
+            if factorization:
+                result = -l
+                for i, p_ in enumerate(factor_base):
+                    result += logs[i] * factorization.get(p_, 0)
+                x = result % n
+                if not verify_result(alpha, x, beta, p):
+                    x = None
+            if x is None:
+                still_pending.append(beta)
+            else:
+                solved_count += 1
+                yield beta, x
+        pending = still_pending
+
+    if observer is not None:
+        observer.phase_finished("descent", time.perf_counter() - descent_start, {
+            "attempts": tester.tested, "smooth_candidates": tester.smooth,
+            "hit_rate": tester.smooth / tester.tested if tester.tested else 0.0,
+            "solved": solved_count, "unsolved": len(pending)})
+    for beta in pending:
+        yield beta, None
+
+def index_calculus(alpha: int, beta: int, n: int, p: int, c: float = 3.38, extra_equations: int = 30, cache: Optional[FactorBaseLogCache] = None, observer: Optional[Observer] = None, large_primes: int = 0, deadline: Optional[Deadline] = None, relation_log: Optional[RelationLog] = None, rank_tracking: bool = True, staged_smoothness: bool = False) -> Optional[int]:
+    solved = solve_factor_base_logs(alpha, n, p, c, extra_equations, cache, observer, large_primes, deadline, relation_log, rank_tracking, staged_smoothness)
+    if solved is None:
+        return None
+    factor_base, logs = solved
+
+    x = individual_logarithm(alpha, beta, n, p, factor_base, logs, observer=observer, deadline=deadline)
+    if x is not None:
+        return x
+
+    if cache is not None:
+        # таблиця з кешу могла виявитися непридатною — наступний виклик перерахує її
+        cache.discard(p, alpha, n, calculate_factor_base_bound(n, c))
+    print("Не вдалося знайти коректний логарифм β")
+    return None
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4:
+        print("Usage: python index_calculus.py <alpha> <beta> <p>")
+        sys.exit(1)
+
+    alpha = int(sys.argv[1])
+    beta = int(sys.argv[2])
+    p = int(sys.argv[3])
+    n = p - 1
+
+    try:
+        print("=== Алгоритм Index-Calculus ===")
+        print(f"p = {p}")
+        print(f"α = {alpha}")
+        print(f"β = {beta}")
+        print(f"n = {n}\n")
+
+        start = time.time()
+        x = index_calculus(alpha, beta, n, p)
+        end = time.time()
+
+        if x is not None:
+            print(f"\nЗнайдено x = {x}")
+            if verify_result(alpha, x, beta, p):
+                print("Перевірка успішна: α^x ≡ β (mod p)")
+            else:
+                print("Помилка: α^x ≢ β (mod p)")
+        else:
+            print("Алгоритм не знайшов розв’язку")
+
+        print(f"\nЧас виконання: {end - start:.2f} с")
+
+    except Exception as e:
+        print(f"Помилка: {e}")
\ No newline at end of file
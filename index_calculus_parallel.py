@@ -1,153 +1,234 @@
 import random
-import math
 import time
 import sys
 from typing import List, Dict, Optional
 import multiprocessing as mp
+import os
+import queue
+import threading
+from multiprocessing.pool import ThreadPool
+from smoothness import BatchSmoothnessTester
+from instrumentation import Observer, phase
+from cancellation import Deadline, check_deadline
+from prime_sieve import primes_up_to
+from candidates import CandidateStream
+from crt_linalg import RankTracker
+from sparse_linalg import SparseRow
+from index_calculus import enough_relations, solve_factor_base_logs, verify_result
 
 
-def is_prime(n: int) -> bool:
-    if n < 2:
-        return False
-    if n in (2, 3):
-        return True
-    if n % 2 == 0 or n % 3 == 0:
-        return False
-    sqrt_n = int(math.sqrt(n))
-    i = 5
-    while i <= sqrt_n:
-        if n % i == 0 or n % (i + 2) == 0:
-            return False
-        i += 6
-    return True
-
-def generate_factor_base(B: int) -> List[int]:
-    return [p for p in range(2, B + 1) if is_prime(p)]
-
-def calculate_factor_base_bound(n: int, c: float = 3.38) -> int:
-    log_n = math.log(n)
-    log_log_n = math.log(log_n)
-    B = c * math.exp(0.5 * math.sqrt(log_n * log_log_n))
-    return int(B)
-
-def trial_factorization(num: int, factor_base: List[int]) -> Optional[Dict[int, int]]:
-    factorization = {}
-    temp = num
-    for p in factor_base:
-        count = 0
-        while temp % p == 0:
-            temp //= p
-            count += 1
-        if count > 0:
-            factorization[p] = count
-    if temp == 1:
-        return factorization
-    return None
-
-def mod_inverse(a: int, m: int) -> int:
-    try:
-        return pow(a, -1, m)
-    except ValueError:
-        raise ValueError(f"mod_inverse: {a} has no inverse mod {m}")
-
-def gaussian_elimination_mod(A: List[List[int]], b: List[int], mod: int) -> Optional[List[int]]:
-    n = len(A)
-    m = len(A[0])
-    A = [row[:] for row in A]
-    b = b[:]
-
-    for col in range(m):
-        pivot_row = None
-        for row in range(col, n):
-            if A[row][col] % mod != 0:
-                try:
-                    mod_inverse(A[row][col], mod)
-                    pivot_row = row
-                    break
-                except ValueError:
-                    continue
-        if pivot_row is None:
-            continue
-        if pivot_row != col:
-            A[col], A[pivot_row] = A[pivot_row], A[col]
-            b[col], b[pivot_row] = b[pivot_row], b[col]
-        inv = mod_inverse(A[col][col], mod)
-        for j in range(m):
-            A[col][j] = (A[col][j] * inv) % mod
-        b[col] = (b[col] * inv) % mod
-        for row in range(n):
-            if row != col and A[row][col] != 0:
-                factor = A[row][col]
-                for j in range(m):
-                    A[row][j] = (A[row][j] - factor * A[col][j]) % mod
-                b[row] = (b[row] - factor * b[col]) % mod
-
-    solution = [0] * m
-    for row in range(n):
-        leading_col = next((i for i, val in enumerate(A[row]) if val != 0), None)
-        if leading_col is None:
-            if b[row] % mod != 0:
-                return None
-        else:
-            solution[leading_col] = b[row] % mod
-    return solution
-
-def verify_result(alpha: int, x: int, beta: int, p: int) -> bool:
-    return pow(alpha, x, p) == beta % p
-
-def worker(alpha: int, p: int, n: int, factor_base: List[int]) -> Optional[tuple[List[int], int]]:
-    k = random.randint(0, n - 1)
-    val = pow(alpha, k, p)
-    factorization = trial_factorization(val, factor_base)
-    if factorization:
-        row = [factorization.get(p_, 0) % n for p_ in factor_base]
-        return (row, k % n)
-    return None
-
-def index_calculus_parallel(alpha: int, beta: int, n: int, p: int, queue_size: int, num_processes: int = 2, c: float = 3.38, extra_equations: int = 30) -> Optional[int]:
-    B = calculate_factor_base_bound(n, c)
-    factor_base = generate_factor_base(B)
-    t = len(factor_base)
-    print(f"Факторна база розміром {t}: {factor_base[:10]}{'...' if t > 10 else ''}")
-
-    A, b = [], []
-    needed = t + extra_equations
-    with mp.Pool(processes=num_processes) as pool:
-        while len(A) < needed:
-            tasks = [pool.apply_async(worker, args=(alpha, p, n, factor_base)) for _ in range(queue_size)]
-            for task in tasks:
-                result = task.get()
-                if result:
-                    row, k_mod = result
-                    A.append(row)
-                    b.append(k_mod)
-                if len(A) >= needed:
-                    break
-        print(f"Зібрано {len(A)} рівняння")
-
-    logs = gaussian_elimination_mod(A, b, n)
-    if logs is None:
-        print("Система не має розв’язку")
-        return None
-
-    print("Отримані логарифми факторної бази:")
-    for p_, log in zip(factor_base, logs):
-        print(f"log_{alpha}({p_}) ≡ {log} (mod {n})")
-
-    for attempt in range(1000):
-        l = random.randint(0, n - 1)
-        val = (beta * pow(alpha, l, p)) % p
-        factorization = trial_factorization(val, factor_base)
+_worker_state: dict = {}
+
+
+def init_worker(relations, stop_event) -> None:
+    _worker_state.update(relations=relations, stop_event=stop_event, job_id=None)
+
+
+def _load_job(job: tuple) -> None:
+    # факторна база надходить у процес один раз на розв'язання, а не з кожним кандидатом
+    job_id, alpha, p, n, factor_base = job
+    if _worker_state.get("job_id") != job_id:
+        _worker_state.update(job_id=job_id, alpha=alpha, p=p, n=n, factor_base=factor_base,
+                             tester=BatchSmoothnessTester(factor_base),
+                             column={p_: i for i, p_ in enumerate(factor_base)})
+
+
+def _worker_id() -> int:
+    # у ThreadPool усі воркери живуть в одному процесі, тож їх розрізняє ідентифікатор потоку
+    return os.getpid() if mp.parent_process() is not None else threading.get_ident()
+
+
+def warm_up(_: int) -> int:
+    primes_up_to(1000)
+    return _worker_id()
+
+
+def relation_stream(job: tuple, seed: int, stream: int = 0, streams: int = 1, block_size: int = 128) -> tuple[int, int, float]:
+    started = time.time()
+    _load_job(job)
+    job_id, alpha, p, n = job[0], _worker_state["alpha"], _worker_state["p"], _worker_state["n"]
+    tester, column = _worker_state["tester"], _worker_state["column"]
+    relations, stop_event = _worker_state["relations"], _worker_state["stop_event"]
+    # спільне seed і власний номер потоку: воркери обходять неперетинні множини показників
+    candidates = CandidateStream(alpha, p, n, seed, stream, streams)
+    tested = 0
+    while not stop_event.is_set():
+        ks, vals = candidates.block(block_size)
+        batch = [(k % n, tuple((column[p_], e) for p_, e in factorization.items()))
+                 for k, factorization in zip(ks, tester.factor_batch(vals)) if factorization]
+        tested += block_size
+        while batch and not stop_event.is_set():
+            try:
+                relations.put((job_id, batch), timeout=0.1)
+                break
+            except queue.Full:
+                continue
+    return _worker_id(), tested, time.time() - started
+
+
+def descent_task(job: tuple, beta: int, logs: List[int], seed: int, stream: int, streams: int, attempts: int) -> tuple[int, int, float, Optional[int]]:
+    started = time.time()
+    _load_job(job)
+    alpha, p, n, factor_base, tester = (_worker_state[key] for key in ("alpha", "p", "n", "factor_base", "tester"))
+    candidates = CandidateStream(alpha, p, n, seed, stream, streams, base=beta)
+    for attempt in range(attempts):
+        (l,), (val,) = candidates.block(1)
+        # спуск потребує точного тесту: раннє відсіювання лишається лише для збору рівнянь
+        factorization = tester.factor_batch([val])[0]
         if factorization:
             result = -l
             for i, p_ in enumerate(factor_base):
                 result += logs[i] * factorization.get(p_, 0)
             x = result % n
             if verify_result(alpha, x, beta, p):
-                return x
+                return _worker_id(), attempt + 1, time.time() - started, x
+    return _worker_id(), attempts, time.time() - started, None
+
+
+class IndexCalculusSession:
+    """Пул воркерів, що живе впродовж усієї пакетної обробки.
+
+    Процеси створюються й прогріваються один раз у __enter__, а далі
+    використовуються для збору співвідношень і спуску в усіх розв'язаннях.
+    Система розв'язується тим самим конвеєром, що й у послідовній реалізації
+    (solve_factor_base_logs: відстеження рангу, розбиття за CRT, розріджений розв'язувач).
+    """
+
+    def __init__(self, num_processes: int = 2, queue_size: int = 8, use_threads: bool = False):
+        self.num_processes = num_processes
+        self.queue_size = queue_size
+        self.use_threads = use_threads
+        self.pool = None
+        self._job_counter = 0
+        self._started = 0.0
+        self.tasks_dispatched = 0
+        self.solves = 0
+        self.worker_busy: Dict[int, float] = {}
+        self.worker_candidates: Dict[int, int] = {}
+
+    def __enter__(self) -> "IndexCalculusSession":
+        if self.use_threads:
+            self.relations, self.stop_event, pool_class = queue.Queue(maxsize=self.queue_size), threading.Event(), ThreadPool
+        else:
+            self.relations, self.stop_event, pool_class = mp.Queue(maxsize=self.queue_size), mp.Event(), mp.Pool
+        self.pool = pool_class(processes=self.num_processes, initializer=init_worker,
+                               initargs=(self.relations, self.stop_event))
+        self._started = time.time()
+        self.pool.map(warm_up, range(self.num_processes))
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop_event.set()
+        self.pool.terminate()
+        self.pool.join()
+
+    def _record(self, pid: int, candidates: int, busy: float) -> None:
+        self.worker_busy[pid] = self.worker_busy.get(pid, 0.0) + busy
+        self.worker_candidates[pid] = self.worker_candidates.get(pid, 0) + candidates
+
+    def _new_job(self, alpha: int, p: int, n: int, factor_base: List[int]) -> tuple:
+        self._job_counter += 1
+        return (self._job_counter, alpha, p, n, factor_base)
+
+    def collect_relations(self, job: tuple, needed: int, counters: Optional[Dict] = None, deadline: Optional[Deadline] = None, rank_tracker: Optional[RankTracker] = None) -> tuple[List[SparseRow], List[int]]:
+        n = job[3]
+        A: List[SparseRow] = []
+        b: List[int] = []
+        found = 0
+        self.stop_event.clear()
+        seed = random.getrandbits(64)
+        streams = self.pool.starmap_async(relation_stream, [(job, seed, i, self.num_processes) for i in range(self.num_processes)])
+        self.tasks_dispatched += self.num_processes
+        tested = 0
+        try:
+            while not enough_relations(len(A), found, needed, rank_tracker):
+                check_deadline(deadline, "relation_collection", relations=len(A), needed=needed)
+                try:
+                    job_id, batch = self.relations.get(timeout=1)
+                except queue.Empty:
+                    if streams.ready():
+                        streams.get()
+                        break
+                    continue
+                if job_id != job[0]:
+                    # залишки попереднього розв'язання
+                    continue
+                for k_mod, sparse_row in batch:
+                    row = {i: e % n for i, e in sparse_row}
+                    found += 1
+                    if rank_tracker is not None and not rank_tracker.add(row, k_mod):
+                        continue
+                    A.append(row)
+                    b.append(k_mod)
+                    if enough_relations(len(A), found, needed, rank_tracker):
+                        break
+        finally:
+            self.stop_event.set()
+            for pid, stream_tested, busy in streams.get():
+                self._record(pid, stream_tested, busy)
+                tested += stream_tested
+        if counters is not None:
+            counters.update(candidates_tested=tested, smooth_candidates=found, relations=len(A))
+            if rank_tracker is not None:
+                counters.update(rank_tracker.stats())
+        return A, b
+
+    def individual_logarithm(self, job: tuple, beta: int, logs: List[int], attempts: int = 1000) -> Optional[int]:
+        share = -(-attempts // self.num_processes)
+        seed = random.getrandbits(64)
+        tasks = [(job, beta, logs, seed, i, self.num_processes, share) for i in range(self.num_processes)]
+        self.tasks_dispatched += len(tasks)
+        x = None
+        for pid, tried, busy, found in self.pool.starmap(descent_task, tasks):
+            self._record(pid, tried, busy)
+            if x is None and found is not None:
+                x = found
+        return x
+
+    def solve(self, alpha: int, beta: int, n: int, p: int, c: float = 3.38, extra_equations: int = 30, observer: Optional[Observer] = None, deadline: Optional[Deadline] = None) -> Optional[int]:
+        self.solves += 1
+        jobs: List[tuple] = []
+
+        def collect(alpha: int, n: int, p: int, factor_base: List[int], needed: int, **kwargs) -> tuple[List[SparseRow], List[int]]:
+            # рівняння збирають воркери пулу; розв'язання системи — спільне з послідовною реалізацією
+            jobs.append(self._new_job(alpha, p, n, factor_base))
+            return self.collect_relations(jobs[-1], needed, **kwargs)
+
+        solved = solve_factor_base_logs(alpha, n, p, c, extra_equations, observer=observer, deadline=deadline, collector=collect)
+        if solved is None:
+            return None
+        factor_base, logs = solved
+
+        with phase(observer, "descent") as counters:
+            candidates_before = sum(self.worker_candidates.values())
+            check_deadline(deadline, "descent")
+            x = self.individual_logarithm(jobs[-1], beta, logs)
+            counters.update(attempts=sum(self.worker_candidates.values()) - candidates_before, solved=x is not None)
+        if x is None:
+            print("Не вдалося знайти коректний логарифм β")
+        return x
+
+    def stats(self) -> Dict:
+        uptime = time.time() - self._started if self._started else 0.0
+        busy = sum(self.worker_busy.values())
+        return {
+            "solves": self.solves,
+            "tasks_dispatched": self.tasks_dispatched,
+            "uptime_seconds": uptime,
+            "idle_seconds": max(0.0, uptime * self.num_processes - busy),
+            "workers": {pid: {"busy_seconds": self.worker_busy[pid],
+                              "candidates": self.worker_candidates[pid],
+                              "candidates_per_second": self.worker_candidates[pid] / self.worker_busy[pid]
+                              if self.worker_busy[pid] else 0.0}
+                        for pid in self.worker_busy},
+        }
+
 
-    print("Не вдалося знайти коректний логарифм β")
-    return None
+def index_calculus_parallel(alpha: int, beta: int, n: int, p: int, queue_size: int, num_processes: int = 2, c: float = 3.38, extra_equations: int = 30, use_threads: bool = False, session: Optional[IndexCalculusSession] = None, observer: Optional[Observer] = None, deadline: Optional[Deadline] = None) -> Optional[int]:
+    if session is not None:
+        return session.solve(alpha, beta, n, p, c, extra_equations, observer, deadline)
+    with IndexCalculusSession(num_processes, queue_size, use_threads) as session:
+        return session.solve(alpha, beta, n, p, c, extra_equations, observer, deadline)
 
 if __name__ == "__main__":
     if len(sys.argv) != 4:
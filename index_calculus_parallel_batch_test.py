@@ -1,7 +1,8 @@
 import time
 import csv
 import os
-from index_calculus_parallel import index_calculus_parallel
+from index_calculus_parallel import index_calculus_parallel, IndexCalculusSession
+from cancellation import Deadline, DeadlineExceeded
 
 INPUT_FILE = "dataset_created_during_the_execution_of_lab#2.csv"
 OUTPUT_FILE = "index_calculus_parallel_batch_results.csv"
@@ -23,7 +24,7 @@ def save_to_csv(problem_type, order_prime_number, alpha, beta, p, x, elapsed, fi
         ])
 
 
-def process_row(row):
+def process_row(row, session):
     try:
         problem_type = int(row["problem_type"])
         order_prime_number = int(row["order_prime_number"])
@@ -34,13 +35,13 @@ def process_row(row):
         start_time = time.time()
         x = None
 
-        while True:
-            if time.time() - start_time > TIMEOUT_SECONDS:
-                print(f"[{p}] Перевищено ліміт {TIMEOUT_SECONDS} сек.")
-                break
-
-            x = index_calculus_parallel(alpha, beta, p - 1, p, 8)
-            break
+        try:
+            x = index_calculus_parallel(alpha, beta, p - 1, p, 8, session=session,
+                                        deadline=Deadline(TIMEOUT_SECONDS))
+        except DeadlineExceeded as e:
+            details = ", ".join(f"{key} = {value}" for key, value in e.progress.items() if key != "phase")
+            print(f"[{p}] Перевищено ліміт {TIMEOUT_SECONDS} сек. на етапі {e.phase}"
+                  f"{': ' + details if details else ''}")
 
         elapsed = time.time() - start_time
 
@@ -57,10 +58,17 @@ def process_row(row):
 
 
 def main():
-    with open(INPUT_FILE, newline="") as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            process_row(row)
+    with IndexCalculusSession(num_processes=2, queue_size=8) as session:
+        with open(INPUT_FILE, newline="") as csvfile:
+            reader = csv.DictReader(csvfile)
+            for row in reader:
+                process_row(row, session)
+
+        stats = session.stats()
+        print(f"Розв'язань: {stats['solves']}, задач у пулі: {stats['tasks_dispatched']}, "
+              f"простій воркерів: {stats['idle_seconds']:.2f} сек")
+        for worker_id, worker_stats in stats["workers"].items():
+            print(f"    воркер {worker_id}: {worker_stats['candidates_per_second']:.0f} кандидатів/сек")
 
 
 if __name__ == "__main__":
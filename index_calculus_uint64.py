@@ -0,0 +1,71 @@
+import sys
+import time
+from functools import partial
+from typing import Optional
+
+from index_calculus import calculate_factor_base_bound, generate_factor_base, index_calculus, verify_result
+from cancellation import Deadline
+from crt_linalg import solve_logs_crt
+from instrumentation import Observer, phase
+from vectorized import VectorizedDescent, collect_relations_uint64, gaussian_elimination_uint64, supports
+
+
+def index_calculus_uint64(alpha: int, beta: int, n: int, p: int, c: float = 3.38, extra_equations: int = 30, observer: Optional[Observer] = None, deadline: Optional[Deadline] = None) -> Optional[int]:
+    # для p >= 2^63 лишається реалізація на цілих Python
+    if not supports(p):
+        return index_calculus(alpha, beta, n, p, c, extra_equations, observer=observer, deadline=deadline)
+
+    with phase(observer, "factor_base") as counters:
+        B = calculate_factor_base_bound(n, c)
+        factor_base = generate_factor_base(B)
+        t = len(factor_base)
+        counters.update(B=B, factor_base_size=t)
+    print(f"Факторна база розміром {t}: {factor_base[:10]}{'...' if t > 10 else ''}")
+
+    with phase(observer, "relation_collection") as counters:
+        start = time.perf_counter()
+        A, b = collect_relations_uint64(alpha, n, p, factor_base, t + extra_equations, counters=counters, deadline=deadline)
+        elapsed = time.perf_counter() - start
+        tested = counters["candidates_tested"]
+        counters["smooth_hit_rate"] = counters["smooth_candidates"] / tested if tested else 0.0
+        counters["relations_per_second"] = len(A) / elapsed if elapsed else 0.0
+    print(f"Зібрано {len(A)} рівнянь")
+
+    with phase(observer, "linear_algebra") as counters:
+        counters.update(rows=len(A), cols=t, nnz=sum(len(row) for row in A))
+        logs = solve_logs_crt(A, b, t, n, alpha, p, factor_base, dense_solver=partial(gaussian_elimination_uint64, deadline=deadline),
+                              stats=counters, deadline=deadline)
+    if logs is None:
+        print("Система не має розв’язку")
+        return None
+
+    with phase(observer, "descent") as counters:
+        descent = VectorizedDescent(factor_base, logs, n)
+        x = descent.solve(alpha, beta, p, deadline=deadline)
+        counters.update(attempts=descent.tested, smooth_candidates=descent.smooth,
+                        hit_rate=descent.smooth / descent.tested if descent.tested else 0.0, solved=x is not None)
+    if x is None:
+        print("Не вдалося знайти коректний логарифм β")
+    return x
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4:
+        print("Usage: python index_calculus_uint64.py <alpha> <beta> <p>")
+        sys.exit(1)
+
+    alpha = int(sys.argv[1])
+    beta = int(sys.argv[2])
+    p = int(sys.argv[3])
+    n = p - 1
+
+    start = time.time()
+    x = index_calculus_uint64(alpha, beta, n, p)
+    end = time.time()
+
+    if x is not None and verify_result(alpha, x, beta, p):
+        print(f"\nЗнайдено x = {x}")
+        print("Перевірка успішна: α^x ≡ β (mod p)")
+    else:
+        print("Алгоритм не знайшов розв’язку")
+    print(f"\nЧас виконання: {end - start:.2f} с")
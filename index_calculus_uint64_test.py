@@ -0,0 +1,128 @@
+import contextlib
+import csv
+import io
+import random
+import sys
+import time
+
+import numpy as np
+
+from index_calculus import gaussian_elimination_mod, index_calculus, trial_factorization
+from index_calculus_uint64 import index_calculus_uint64
+from number_theory import factorize
+from prime_sieve import primes_up_to
+from vectorized import gaussian_elimination_numpy, gaussian_elimination_uint64, mulmod, smooth_exponents, smooth_screen
+
+INPUT_FILE = "dataset_created_during_the_execution_of_lab#2.csv"
+SEED = 2024
+BIT_SIZES = (16, 31, 32, 33, 40, 48, 56, 62, 63)
+
+
+def element_order(alpha: int, p: int) -> int:
+    order = p - 1
+    for q in factorize(p - 1):
+        while order % q == 0 and pow(alpha, order // q, p) == 1:
+            order //= q
+    return order
+
+
+def check_mulmod(rng: random.Random) -> int:
+    failures = 0
+    for bits in BIT_SIZES:
+        p = rng.randrange(1 << (bits - 1), 1 << bits) | 1
+        a = [rng.randrange(p) for _ in range(1000)]
+        b = [rng.randrange(p) for _ in range(1000)]
+        result = mulmod(np.array(a, dtype=np.uint64), np.array(b, dtype=np.uint64), p)
+        if [int(v) for v in result] != [x * y % p for x, y in zip(a, b)]:
+            print(f"mulmod: розбіжність для {bits}-бітного модуля {p}")
+            failures += 1
+    return failures
+
+
+def check_smoothness(rng: random.Random) -> int:
+    failures = 0
+    factor_base = primes_up_to(200).tolist()
+    primes = np.array(factor_base, dtype=np.uint64)
+    for bits in BIT_SIZES:
+        # кандидати з гарантовано гладкими серед них: добутки простих бази
+        values = [rng.randrange(1, 1 << bits) for _ in range(500)]
+        for i in range(0, len(values), 5):
+            v = 1
+            while v * factor_base[-1] < 1 << bits and rng.random() < 0.9:
+                v *= rng.choice(factor_base)
+            values[i] = v
+        array = np.array(values, dtype=np.uint64)
+        mask = smooth_screen(array, primes)
+        expected = [trial_factorization(v, factor_base) for v in values]
+        if [bool(m) for m in mask] != [f is not None for f in expected]:
+            print(f"smooth_screen: розбіжність для {bits}-бітних кандидатів")
+            failures += 1
+            continue
+        hits = np.flatnonzero(mask)
+        for j, exponents in zip(hits, smooth_exponents(array[hits], primes)):
+            if {factor_base[i]: int(e) for i, e in enumerate(exponents) if e} != expected[j]:
+                print(f"smooth_exponents: розбіжність для {values[j]}")
+                failures += 1
+    return failures
+
+
+def check_elimination(rng: random.Random) -> int:
+    failures = 0
+    for mod in (97, 2 ** 31 - 1, 2 ** 31, 1000000006, 10 ** 12 + 39, 2 ** 62 + 135):
+        for _ in range(20):
+            rows, cols = rng.randint(3, 15), rng.randint(2, 10)
+            A = [[rng.choice([0, 0, 1, 2, rng.randrange(mod)]) for _ in range(cols)] for _ in range(rows)]
+            x = [rng.randrange(mod) for _ in range(cols)]
+            b = [sum(a * v for a, v in zip(row, x)) % mod for row in A]
+            expected = gaussian_elimination_mod(A, b, mod)
+            if gaussian_elimination_uint64(A, b, mod) != expected:
+                print(f"gaussian_elimination_uint64: розбіжність за модулем {mod}")
+                failures += 1
+            if gaussian_elimination_numpy(A, b, mod) != expected:
+                print(f"gaussian_elimination_numpy: розбіжність за модулем {mod}")
+                failures += 1
+    return failures
+
+
+def check_dataset(filename: str) -> int:
+    failures = 0
+    with open(filename, newline="") as csvfile:
+        rows = list(csv.DictReader(csvfile))
+    for row in rows:
+        alpha, beta, p = int(row["alpha"]), int(row["beta"]), int(row["p"])
+        results = {}
+        for name, engine in (("python", index_calculus), ("uint64", index_calculus_uint64)):
+            start = time.time()
+            with contextlib.redirect_stdout(io.StringIO()):
+                x = engine(alpha, beta, p - 1, p)
+            results[name] = (x, time.time() - start)
+
+        (x_python, t_python), (x_uint64, t_uint64) = results["python"], results["uint64"]
+        # логарифм визначено з точністю до порядку alpha, тож порівнюються класи лишків
+        order = element_order(alpha, p)
+        solved = [x for x in (x_python, x_uint64) if x is not None]
+        if any(pow(alpha, x, p) != beta % p for x in solved) or len({x % order for x in solved}) > 1:
+            print(f"[{p}] розбіжність: python = {x_python}, uint64 = {x_uint64}")
+            failures += 1
+        else:
+            print(f"[{p}] python: {x_python} ({t_python:.4f} сек), uint64: {x_uint64} ({t_uint64:.4f} сек)")
+    return failures
+
+
+def main():
+    rng = random.Random(SEED)
+    random.seed(SEED)
+    input_file = sys.argv[1] if len(sys.argv) > 1 else INPUT_FILE
+    failures = {
+        "mulmod": check_mulmod(rng),
+        "smoothness": check_smoothness(rng),
+        "elimination": check_elimination(rng),
+        "dataset": check_dataset(input_file),
+    }
+    for name, count in failures.items():
+        print(f"{name}: {'OK' if count == 0 else f'{count} розбіжностей'}")
+    sys.exit(1 if any(failures.values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
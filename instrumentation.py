@@ -0,0 +1,55 @@
+import json
+import time
+from contextlib import contextmanager
+from typing import Dict, IO, Iterator, List, Optional
+
+
+class Observer:
+    """Базовий спостерігач за етапами алгоритму; методи перевизначаються за потреби."""
+
+    def phase_started(self, phase: str) -> None:
+        pass
+
+    def phase_finished(self, phase: str, seconds: float, counters: Dict) -> None:
+        pass
+
+
+class PhaseProfiler(Observer):
+    def __init__(self):
+        self.phases: List[Dict] = []
+
+    def phase_finished(self, phase: str, seconds: float, counters: Dict) -> None:
+        self.phases.append({"phase": phase, "seconds": seconds, **counters})
+
+    def totals(self) -> Dict[str, float]:
+        totals: Dict[str, float] = {}
+        for entry in self.phases:
+            totals[entry["phase"]] = totals.get(entry["phase"], 0.0) + entry["seconds"]
+        return totals
+
+    def to_json(self) -> str:
+        return json.dumps({"phases": self.phases, "totals": self.totals()}, ensure_ascii=False)
+
+
+class JsonLinesObserver(Observer):
+    def __init__(self, stream: IO[str], **context):
+        self.stream = stream
+        self.context = context
+
+    def phase_finished(self, phase: str, seconds: float, counters: Dict) -> None:
+        self.stream.write(json.dumps({**self.context, "phase": phase, "seconds": seconds, **counters},
+                                     ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+
+@contextmanager
+def phase(observer: Optional[Observer], name: str) -> Iterator[Dict]:
+    counters: Dict = {}
+    if observer is not None:
+        observer.phase_started(name)
+    start = time.perf_counter()
+    try:
+        yield counters
+    finally:
+        if observer is not None:
+            observer.phase_finished(name, time.perf_counter() - start, counters)
@@ -0,0 +1,121 @@
+from typing import Dict, List, Optional, Tuple
+
+from number_theory import is_probable_prime, pollard_rho
+from sparse_linalg import SparseRow
+
+# Часткове співвідношення alpha^k = S * L1 * L2, де S розкладається над факторною базою,
+# а L1, L2 — великі прості (L2 = 1 для варіації з одним великим простим).
+Partial = Tuple[int, SparseRow, int, int]
+
+
+class LargePrimeCombiner:
+    """Зберігає часткові співвідношення й складає з них повні.
+
+    Великі прості — вершини графа (разом із фіктивною вершиною 1), часткові
+    співвідношення — ребра. Ребро, що замикає цикл, дає повне співвідношення:
+    ребра циклу беруться зі знаками, що чергуються, і великі прості скорочуються.
+    """
+
+    def __init__(self, n: int, factor_base_bound: int, large_prime_bound: int, double: bool = False):
+        self.n = n
+        self.B = factor_base_bound
+        self.L = large_prime_bound
+        self.double = double
+        self.parent: Dict[int, int] = {1: 1}
+        self.tree: Dict[int, List[Tuple[int, Partial]]] = {1: []}
+        self.partials = 0
+        self.combined = 0
+
+    def cofactor_bound(self) -> int:
+        return self.L * self.L if self.double else self.L
+
+    def split_cofactor(self, cofactor: int) -> Optional[Tuple[int, int]]:
+        if cofactor <= self.B:
+            return None
+        if cofactor <= self.L and (cofactor < self.B * self.B or is_probable_prime(cofactor)):
+            return cofactor, 1
+        if not self.double or is_probable_prime(cofactor):
+            return None
+        d = pollard_rho(cofactor)
+        l1, l2 = sorted((d, cofactor // d))
+        if l1 <= self.B or l2 > self.L or not (is_probable_prime(l1) and is_probable_prime(l2)):
+            return None
+        return l1, l2
+
+    def _find(self, v: int) -> int:
+        root = v
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[v] != root:
+            self.parent[v], v = root, self.parent[v]
+        return root
+
+    def _tree_path(self, u: int, v: int) -> List[Tuple[int, Partial]]:
+        # шлях u -> v у лісі остовних дерев: список (наступна вершина, ребро)
+        previous: Dict[int, Optional[Tuple[int, Partial]]] = {u: None}
+        frontier = [u]
+        while frontier and v not in previous:
+            next_frontier = []
+            for w in frontier:
+                for x, edge in self.tree[w]:
+                    if x not in previous:
+                        previous[x] = (w, edge)
+                        next_frontier.append(x)
+            frontier = next_frontier
+        path = []
+        node = v
+        while previous[node] is not None:
+            w, edge = previous[node]
+            path.append((node, edge))
+            node = w
+        return path[::-1]
+
+    def _combine(self, cycle: List[Partial]) -> Optional[Tuple[SparseRow, int]]:
+        row: Dict[int, int] = {}
+        large: Dict[int, int] = {}
+        k_total = 0
+        for i, (k, exponents, l1, l2) in enumerate(cycle):
+            sign = 1 if i % 2 == 0 else -1
+            k_total += sign * k
+            for col, e in exponents.items():
+                row[col] = row.get(col, 0) + sign * e
+            for l in (l1, l2):
+                if l != 1:
+                    large[l] = large.get(l, 0) + sign
+        if any(large.values()):
+            return None
+        row = {col: e % self.n for col, e in row.items() if e % self.n}
+        if not row:
+            return None
+        self.combined += 1
+        return row, k_total % self.n
+
+    def add(self, k: int, exponents: SparseRow, cofactor: int) -> List[Tuple[SparseRow, int]]:
+        split = self.split_cofactor(cofactor)
+        if split is None:
+            return []
+        l1, l2 = split
+        self.partials += 1
+        edge: Partial = (k, exponents, l1, l2)
+        for l in (l1, l2):
+            if l not in self.parent:
+                self.parent[l] = l
+                self.tree[l] = []
+
+        ru, rv = self._find(l1), self._find(l2)
+        if ru != rv:
+            self.parent[ru] = rv
+            self.tree[l1].append((l2, edge))
+            self.tree[l2].append((l1, edge))
+            return []
+
+        # ребро замикає цикл: шлях від l2 до l1 у дереві плюс саме ребро
+        path = self._tree_path(l2, l1)
+        vertices = [l2] + [node for node, _ in path]
+        cycle = [e for _, e in path] + [edge]
+        if len(cycle) % 2 == 1 and 1 in vertices:
+            # непарний цикл скорочується лише тоді, коли починається у вершині 1
+            shift = vertices.index(1)
+            cycle = cycle[shift:] + cycle[:shift]
+        combined = self._combine(cycle)
+        return [combined] if combined is not None else []
@@ -0,0 +1,112 @@
+from math import gcd
+from typing import Dict, List
+
+from prime_sieve import primes_up_to
+
+_MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+
+def is_probable_prime(n: int) -> bool:
+    if n < 2:
+        return False
+    for q in _MILLER_RABIN_BASES:
+        if n % q == 0:
+            return n == q
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    # для n < 3.3 * 10^24 ці основи дають детермінований результат
+    for a in _MILLER_RABIN_BASES:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def berlekamp_massey(seq: List[int], q: int) -> List[int]:
+    C, B = [1], [1]
+    L, m, b = 0, 1, 1
+    for i, s in enumerate(seq):
+        d = s
+        for j in range(1, L + 1):
+            d = (d + C[j] * seq[i - j]) % q
+        if d == 0:
+            m += 1
+            continue
+        coef = d * pow(b, -1, q) % q
+        T = C[:]
+        C = C + [0] * (len(B) + m - len(C))
+        for j, bj in enumerate(B):
+            C[j + m] = (C[j + m] - coef * bj) % q
+        if 2 * L <= i:
+            L, B, b, m = i + 1 - L, T, d, 1
+        else:
+            m += 1
+    return C[:L + 1]
+
+
+def pollard_rho(n: int) -> int:
+    if n % 2 == 0:
+        return 2
+    c = 1
+    while True:
+        # варіант Брента з накопиченням добутку різниць
+        y, r, q, g = 2, 1, 1, 1
+        x = ys = y
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(128, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += 128
+            r *= 2
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = gcd(abs(x - ys), n)
+        if g != n:
+            return g
+        c += 1
+
+
+def factorize(n: int, trial_bound: int = 10000) -> Dict[int, int]:
+    factors: Dict[int, int] = {}
+    for q in primes_up_to(trial_bound):
+        if q * q > n:
+            break
+        while n % q == 0:
+            factors[q] = factors.get(q, 0) + 1
+            n //= q
+    stack = [n] if n > 1 else []
+    while stack:
+        m = stack.pop()
+        if is_probable_prime(m):
+            factors[m] = factors.get(m, 0) + 1
+            continue
+        d = pollard_rho(m)
+        stack.extend((d, m // d))
+    return dict(sorted(factors.items()))
+
+
+def crt(residues: List[int], moduli: List[int]) -> int:
+    x, M = 0, 1
+    for r, m in zip(residues, moduli):
+        # x ≡ r (mod m), модулі попарно взаємно прості
+        t = (r - x) * pow(M, -1, m) % m
+        x += M * t
+        M *= m
+    return x % M
@@ -0,0 +1,40 @@
+import threading
+from array import array
+from bisect import bisect_right
+from itertools import compress
+from math import isqrt
+
+SEGMENT_SIZE = 1 << 16
+
+# Кеш простих чисел на весь процес: решето розширюється посегментно лише тоді,
+# коли запитують межу, більшу за вже просіяну.
+_primes = array("I", [2, 3, 5, 7])
+_limit = 10
+_lock = threading.Lock()
+
+
+def _sieve_segment(lo: int, hi: int) -> None:
+    global _limit
+    segment = bytearray(b"\x01") * (hi - lo + 1)
+    for q in _primes[:bisect_right(_primes, isqrt(hi))]:
+        start = max(q * q, (lo + q - 1) // q * q)
+        if start > hi:
+            continue
+        segment[start - lo::q] = bytes(len(range(start - lo, hi - lo + 1, q)))
+    _primes.extend(compress(range(lo, hi + 1), segment))
+    _limit = hi
+
+
+def _extend(B: int) -> None:
+    while _limit < B:
+        lo = _limit + 1
+        # межа сегмента не може перевищувати квадрат уже просіяної межі
+        hi = min(B, lo + SEGMENT_SIZE - 1, (_limit + 1) ** 2 - 1)
+        _sieve_segment(lo, hi)
+
+
+def primes_up_to(B: int) -> array:
+    if B > _limit:
+        with _lock:
+            _extend(B)
+    return _primes[:bisect_right(_primes, B)]
@@ -0,0 +1,171 @@
+import hashlib
+import os
+import sys
+from typing import Dict, List, Optional, Set, Tuple
+
+from sparse_linalg import SparseRow
+
+LOG_DIR = "relation_logs"
+
+# Формат журналу — текстовий, по рядку на співвідношення:
+#   # p=<p> alpha=<alpha> fb=<відбиток факторної бази> t=<розмір бази>
+#   <k> <стовпець>:<показник> <стовпець>:<показник> ...
+# Рядки лише дописуються в кінець, тож після аварійного завершення може
+# постраждати хіба що останній рядок — такий рядок під час читання пропускається.
+
+RelationKey = Tuple[int, Tuple[Tuple[int, int], ...]]
+
+
+def factor_base_digest(factor_base: List[int]) -> str:
+    return hashlib.sha1(",".join(map(str, factor_base)).encode()).hexdigest()[:16]
+
+
+def _header(p: int, alpha: int, factor_base: List[int]) -> str:
+    return f"# p={p} alpha={alpha} fb={factor_base_digest(factor_base)} t={len(factor_base)}"
+
+
+def _format(row: SparseRow, k: int) -> str:
+    return " ".join([str(k)] + [f"{col}:{e}" for col, e in sorted(row.items())])
+
+
+def _parse(line: str) -> Optional[Tuple[SparseRow, int]]:
+    fields = line.split()
+    if not fields:
+        return None
+    try:
+        k = int(fields[0])
+        row = {}
+        for field in fields[1:]:
+            col, e = field.split(":")
+            row[int(col)] = int(e)
+    except ValueError:
+        return None
+    return row, k
+
+
+def read_log(path: str) -> Tuple[str, List[Tuple[SparseRow, int]]]:
+    relations = []
+    with open(path) as file:
+        header = file.readline().rstrip("\n")
+        if not header.startswith("# "):
+            raise ValueError(f"{path}: не є журналом співвідношень")
+        for line in file:
+            # рядок без символу кінця рядка міг бути дописаний не до кінця
+            if not line.endswith("\n"):
+                break
+            relation = _parse(line)
+            if relation is not None:
+                relations.append(relation)
+    return header, relations
+
+
+class RelationLogFile:
+    """Журнал співвідношень для однієї трійки (p, alpha, факторна база).
+
+    Після відкриття містить усі раніше збережені співвідношення без повторів
+    у rows/b; add() дописує нове співвідношення на диск одразу.
+    """
+
+    def __init__(self, path: str, header: str, n: int):
+        self.path = path
+        self.n = n
+        self.rows: List[SparseRow] = []
+        self.b: List[int] = []
+        self._seen: Set[RelationKey] = set()
+        if os.path.isfile(path) and os.path.getsize(path) > 0:
+            existing_header, relations = read_log(path)
+            if existing_header != header:
+                raise ValueError(f"{path}: журнал належить іншій задачі ({existing_header})")
+            for row, k in relations:
+                self._remember(row, k)
+            self.loaded = len(self.rows)
+            self._drop_torn_tail()
+            self._file = open(path, "a")
+        else:
+            self.loaded = 0
+            self._file = open(path, "a")
+            self._file.write(header + "\n")
+        self._file.flush()
+
+    def _drop_torn_tail(self) -> None:
+        # недописаний останній рядок обрізається, щоб нові записи не склеїлися з ним
+        with open(self.path, "rb+") as file:
+            data = file.read()
+            if not data.endswith(b"\n"):
+                file.truncate(data.rfind(b"\n") + 1)
+
+    def _remember(self, row: SparseRow, k: int) -> bool:
+        row = {col: e % self.n for col, e in row.items() if e % self.n}
+        key = (k % self.n, tuple(sorted(row.items())))
+        if not row or key in self._seen:
+            return False
+        self._seen.add(key)
+        self.rows.append(row)
+        self.b.append(k % self.n)
+        return True
+
+    def add(self, row: SparseRow, k: int) -> bool:
+        if not self._remember(row, k):
+            return False
+        self._file.write(_format(self.rows[-1], self.b[-1]) + "\n")
+        self._file.flush()
+        return True
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "RelationLogFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class RelationLog:
+    """Каталог журналів співвідношень: по файлу на (p, alpha, факторна база).
+
+    Перерваний збір співвідношень продовжується з того місця, де зупинився:
+    collect_relations підвантажує збережені рівняння й шукає лише ті, яких бракує.
+    """
+
+    def __init__(self, directory: str = LOG_DIR):
+        self.directory = directory
+
+    def path(self, p: int, alpha: int, factor_base: List[int]) -> str:
+        return os.path.join(self.directory, f"{p}_{alpha}_{factor_base_digest(factor_base)}.rel")
+
+    def open(self, p: int, alpha: int, factor_base: List[int], n: int) -> RelationLogFile:
+        os.makedirs(self.directory, exist_ok=True)
+        return RelationLogFile(self.path(p, alpha, factor_base), _header(p, alpha, factor_base), n)
+
+
+def merge_logs(target: str, sources: List[str]) -> int:
+    # об'єднує журнали, зібрані незалежно (наприклад, на різних машинах) для тієї самої задачі
+    header: Optional[str] = None
+    relations: Dict[RelationKey, None] = {}
+    for path in sources:
+        source_header, source_relations = read_log(path)
+        if header is None:
+            header = source_header
+        elif source_header != header:
+            raise ValueError(f"{path}: журнал належить іншій задачі ({source_header})")
+        for row, k in source_relations:
+            relations.setdefault((k, tuple(sorted(row.items()))), None)
+    if header is None:
+        raise ValueError("merge_logs: не задано жодного журналу")
+
+    tmp_path = target + ".tmp"
+    with open(tmp_path, "w") as file:
+        file.write(header + "\n")
+        for k, row in relations:
+            file.write(_format(dict(row), k) + "\n")
+    os.replace(tmp_path, target)
+    return len(relations)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4 or sys.argv[1] != "merge":
+        print("Usage: python relation_log.py merge <output.rel> <input.rel> [<input.rel> ...]")
+        sys.exit(1)
+    count = merge_logs(sys.argv[2], sys.argv[3:])
+    print(f"Об'єднано {count} різних співвідношень у {sys.argv[2]}")
@@ -0,0 +1,309 @@
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from index_calculus import individual_logarithm, solve_factor_base_logs
+from cancellation import Deadline, DeadlineExceeded
+
+# Локальний сервіс дискретного логарифма поверх HTTP/1.1 (TCP або Unix-сокет):
+#   POST /solve   {"alpha": ..., "beta": ..., "p": ..., "n": ..., "timeout": ...}
+#   GET  /health  стан сервісу
+#   GET  /metrics лічильники запитів, об'єднань, відмов і зайнятості виконавців
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# p понад стільки бітів розв'язуються окремим виконавцем зі своєю квотою запитів
+LARGE_P_BITS = 40
+MAX_PENDING = 64
+MAX_PENDING_LARGE = 4
+MAX_TABLES = 64
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 503: "Service Unavailable"}
+
+Table = Tuple[List[int], List[int]]
+
+
+def _quiet_worker() -> None:
+    # діагностичний вивід розв'язувача в процесах-виконавцях не потрібен
+    sys.stdout = open(os.devnull, "w")
+
+
+# Deadline передається у виконавця як залишок часу на момент відправлення, тож завдання
+# зупиняється саме, а DeadlineExceeded повертається до сервісу через pickle
+def table_job(alpha: int, n: int, p: int, deadline: Deadline) -> Optional[Table]:
+    return solve_factor_base_logs(alpha, n, p, deadline=deadline)
+
+
+def descent_job(alpha: int, beta: int, n: int, p: int, factor_base: List[int], logs: List[int], deadline: Optional[Deadline]) -> Optional[int]:
+    return individual_logarithm(alpha, beta, n, p, factor_base, logs, deadline=deadline)
+
+
+class DiscreteLogService:
+    """Асинхронний сервіс із об'єднанням запитів за (p, alpha, n).
+
+    Збір співвідношень і лінійна алгебра для пари (p, alpha) виконуються одним
+    завданням, на яке чекають усі одночасні запити; кожен запит потім виконує
+    лише власний спуск. Обчислення йдуть у пули процесів: великі p мають окремий
+    пул і окрему квоту, тож не витісняють дрібні. До квоти входять запити в роботі
+    й завдання для таблиць, що ще виконуються (навіть якщо їхні запити вже отримали
+    timeout). Понад квоту сервіс відповідає 503 замість того, щоб накопичувати чергу.
+    """
+
+    def __init__(self, workers: int = os.cpu_count() or 1, large_workers: int = 1, large_bits: int = LARGE_P_BITS, max_pending: int = MAX_PENDING, max_pending_large: int = MAX_PENDING_LARGE, table_seconds: Optional[float] = None, max_tables: int = MAX_TABLES):
+        self.workers = max(1, workers)
+        self.large_workers = max(1, large_workers)
+        self.large_bits = large_bits
+        self.limits = {"small": max_pending, "large": max_pending_large}
+        self.table_seconds = table_seconds
+        self.max_tables = max_tables
+        self.executors: Dict[str, ProcessPoolExecutor] = {}
+        self.tables: "OrderedDict[Tuple[int, int, int], Table]" = OrderedDict()
+        self.jobs: Dict[Tuple[int, int, int], asyncio.Future] = {}
+        self.pending = {"small": 0, "large": 0}
+        self.running_tables = {"small": 0, "large": 0}
+        self.counters: Dict[str, int] = {"requests": 0, "rejected": 0, "table_jobs": 0, "coalesced": 0, "table_hits": 0}
+        self.statuses: Dict[str, int] = {}
+        self.latency = 0.0
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.started = time.time()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_path: Optional[str] = None) -> asyncio.AbstractServer:
+        # процеси створюються на вимогу вже під час обслуговування; з fork вони успадкували б
+        # сокети відкритих з'єднань, і клієнт не отримав би кінця відповіді
+        context = mp.get_context("forkserver")
+        self.executors = {
+            "small": ProcessPoolExecutor(max_workers=self.workers, mp_context=context, initializer=_quiet_worker),
+            "large": ProcessPoolExecutor(max_workers=self.large_workers, mp_context=context, initializer=_quiet_worker),
+        }
+        if unix_path is not None:
+            self.server = await asyncio.start_unix_server(self._handle, path=unix_path)
+        else:
+            self.server = await asyncio.start_server(self._handle, host, port)
+        self.started = time.time()
+        return self.server
+
+    async def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for executor in self.executors.values():
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def size_class(self, p: int) -> str:
+        return "large" if p.bit_length() > self.large_bits else "small"
+
+    async def _run(self, size_class: str, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executors[size_class], function, *args)
+
+    async def _table(self, alpha: int, n: int, p: int) -> Optional[Table]:
+        key = (p, alpha, n)
+        if key in self.tables:
+            self.tables.move_to_end(key)
+            self.counters["table_hits"] += 1
+            return self.tables[key]
+        job = self.jobs.get(key)
+        if job is None:
+            size_class = self.size_class(p)
+            self.counters["table_jobs"] += 1
+            # завдання спільне для всіх запитів, тож обмежене лише table_seconds, а не тайм-аутом запиту
+            job = asyncio.ensure_future(self._run(size_class, table_job, alpha, n, p, Deadline(self.table_seconds)))
+            self.jobs[key] = job
+            self.running_tables[size_class] += 1
+            job.add_done_callback(lambda done: self._table_finished(key, size_class, done))
+        else:
+            self.counters["coalesced"] += 1
+        # shield: тайм-аут одного запиту не скасовує спільне завдання для інших
+        return await asyncio.shield(job)
+
+    def _table_finished(self, key: Tuple[int, int, int], size_class: str, job: asyncio.Future) -> None:
+        self.jobs.pop(key, None)
+        self.running_tables[size_class] -= 1
+        if job.cancelled() or job.exception() is not None or job.result() is None:
+            return
+        self.tables[key] = job.result()
+        while len(self.tables) > self.max_tables:
+            self.tables.popitem(last=False)
+
+    async def _solve(self, alpha: int, beta: int, n: int, p: int, deadline: Optional[Deadline]) -> Optional[int]:
+        # очікування таблиці обмежене залишком часу запиту, саме завдання продовжується для інших
+        table = await asyncio.wait_for(self._table(alpha, n, p), deadline.remaining() if deadline is not None else None)
+        if table is None:
+            return None
+        factor_base, logs = table
+        # спуск отримує залишок бюджету після етапу таблиці й зупиняється сам, тож запит
+        # звільняє місце в квоті лише тоді, коли виконавець справді завершив його роботу
+        x = await self._run(self.size_class(p), descent_job, alpha, beta, n, p, factor_base, logs, deadline)
+        if x is None:
+            # таблиця могла виявитися непридатною — наступний запит перерахує її
+            self.tables.pop((p, alpha, n), None)
+        return x
+
+    async def solve(self, alpha: int, beta: int, p: int, n: Optional[int] = None, timeout: Optional[float] = None) -> Dict:
+        n = p - 1 if n is None else n
+        size_class = self.size_class(p)
+        self.counters["requests"] += 1
+        if self.pending[size_class] + self.running_tables[size_class] >= self.limits[size_class]:
+            self.counters["rejected"] += 1
+            return self._finish({"x": None, "status": "busy"}, 0.0)
+
+        self.pending[size_class] += 1
+        start = time.perf_counter()
+        try:
+            x = await self._solve(alpha, beta, n, p, Deadline(timeout) if timeout is not None else None)
+            result = {"x": x, "status": "ok" if x is not None else "not_found"}
+        except (asyncio.TimeoutError, DeadlineExceeded):
+            result = {"x": None, "status": "timeout"}
+        except Exception as e:
+            result = {"x": None, "status": "error", "error": repr(e)}
+        finally:
+            self.pending[size_class] -= 1
+        return self._finish(result, time.perf_counter() - start)
+
+    def _finish(self, result: Dict, seconds: float) -> Dict:
+        self.statuses[result["status"]] = self.statuses.get(result["status"], 0) + 1
+        self.latency += seconds
+        result["seconds"] = seconds
+        return result
+
+    def health(self) -> Dict:
+        return {"status": "ok", "uptime_seconds": time.time() - self.started}
+
+    def metrics(self) -> Dict:
+        served = sum(count for status, count in self.statuses.items() if status != "busy")
+        return {**self.counters, "statuses": dict(self.statuses), "pending": dict(self.pending),
+                "running_tables": dict(self.running_tables),
+                "limits": dict(self.limits), "running_table_jobs": len(self.jobs), "cached_tables": len(self.tables),
+                "mean_latency_seconds": self.latency / served if served else 0.0,
+                "uptime_seconds": time.time() - self.started}
+
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, Dict]:
+        if method == "GET" and path == "/health":
+            return 200, self.health()
+        if method == "GET" and path == "/metrics":
+            return 200, self.metrics()
+        if method == "POST" and path == "/solve":
+            try:
+                query = json.loads(body or b"{}")
+                alpha, beta, p = int(query["alpha"]), int(query["beta"]), int(query["p"])
+                n = int(query["n"]) if query.get("n") is not None else None
+                timeout = float(query["timeout"]) if query.get("timeout") is not None else None
+            except (ValueError, KeyError, TypeError) as e:
+                return 400, {"status": "error", "error": repr(e)}
+            result = await self.solve(alpha, beta, p, n, timeout)
+            return (503 if result["status"] == "busy" else 200), result
+        return 404, {"status": "error", "error": f"{method} {path}"}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            method, path, _ = (await reader.readline()).decode().split(" ", 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode().partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+            status, payload = await self._route(method, path, body)
+        except (ValueError, asyncio.IncompleteReadError) as e:
+            status, payload = 400, {"status": "error", "error": repr(e)}
+        data = json.dumps(payload).encode()
+        writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode() + data)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+
+class ServiceClient:
+    """Мінімальний клієнт сервісу: одне з'єднання на запит, без зовнішніх залежностей."""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_path: Optional[str] = None):
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+
+    async def request(self, method: str, path: str, payload: Optional[Dict] = None) -> Tuple[int, Dict]:
+        if self.unix_path is not None:
+            reader, writer = await asyncio.open_unix_connection(self.unix_path)
+        else:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode() if payload is not None else b""
+        writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+        status = int((await reader.readline()).split(b" ", 2)[1])
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode().partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        data = await reader.readexactly(length)
+        writer.close()
+        return status, json.loads(data)
+
+    async def solve(self, alpha: int, beta: int, p: int, n: Optional[int] = None, timeout: Optional[float] = None) -> Dict:
+        _, result = await self.request("POST", "/solve", {"alpha": alpha, "beta": beta, "p": p, "n": n, "timeout": timeout})
+        return result
+
+    async def health(self) -> Dict:
+        return (await self.request("GET", "/health"))[1]
+
+    async def metrics(self) -> Dict:
+        return (await self.request("GET", "/metrics"))[1]
+
+
+async def serve(args) -> None:
+    service = DiscreteLogService(args.workers, args.large_workers, args.large_bits, args.max_pending, args.max_pending_large, args.table_timeout)
+    server = await service.start(args.host, args.port, args.unix)
+    address = args.unix or "{}:{}".format(*server.sockets[0].getsockname()[:2])
+    print(f"Сервіс слухає {address}", file=sys.stderr)
+    try:
+        await server.serve_forever()
+    finally:
+        await service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Локальний сервіс дискретного логарифма")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", default=None, help="шлях до Unix-сокета замість TCP")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve")
+    serve_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    serve_parser.add_argument("--large-workers", type=int, default=1)
+    serve_parser.add_argument("--large-bits", type=int, default=LARGE_P_BITS)
+    serve_parser.add_argument("--max-pending", type=int, default=MAX_PENDING)
+    serve_parser.add_argument("--max-pending-large", type=int, default=MAX_PENDING_LARGE)
+    serve_parser.add_argument("--table-timeout", type=float, default=None)
+    solve_parser = commands.add_parser("solve")
+    solve_parser.add_argument("alpha", type=int)
+    solve_parser.add_argument("beta", type=int)
+    solve_parser.add_argument("p", type=int)
+    solve_parser.add_argument("--timeout", type=float, default=None)
+    commands.add_parser("health")
+    commands.add_parser("metrics")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(args))
+        except KeyboardInterrupt:
+            pass
+    else:
+        client = ServiceClient(args.host, args.port, args.unix)
+        if args.command == "solve":
+            result = asyncio.run(client.solve(args.alpha, args.beta, args.p, timeout=args.timeout))
+        else:
+            result = asyncio.run(getattr(client, args.command)())
+        print(json.dumps(result, indent=2))
@@ -0,0 +1,92 @@
+import asyncio
+import csv
+import random
+import sys
+
+from service import DiscreteLogService, ServiceClient
+
+INPUT_FILE = "dataset_created_during_the_execution_of_lab#2.csv"
+MAX_P = 10 ** 10
+BETAS_PER_PAIR = 3
+SEED = 2024
+# квоти з запасом: перевірка об'єднання надсилає всі запити одночасно
+QUERY_LIMIT = 1000
+
+
+async def check_coalescing(client: ServiceClient, service: DiscreteLogService, rows) -> int:
+    # усі запити надсилаються одночасно, по кілька β на кожну пару (p, alpha):
+    # на пару має припасти одне завдання для таблиці, решта запитів до нього приєднується
+    failures = 0
+    rng = random.Random(SEED)
+    queries = [(alpha, beta, p) for alpha, beta, p in rows]
+    queries += [(alpha, pow(alpha, rng.randrange(p - 1), p), p) for alpha, _, p in rows for _ in range(BETAS_PER_PAIR - 1)]
+    results = await asyncio.gather(*(client.solve(alpha, beta, p) for alpha, beta, p in queries))
+    for (alpha, beta, p), result in zip(queries, results):
+        x = result["x"]
+        if x is not None and pow(alpha, x, p) != beta % p:
+            print(f"[{p}] хибна відповідь x = {x}")
+            failures += 1
+    pairs = {(p, alpha) for alpha, _, p in rows}
+    metrics = await client.metrics()
+    statuses = metrics["statuses"]
+    print(f"Запитів: {len(queries)}, пар (p, alpha): {len(pairs)}, завдань для таблиць: {metrics['table_jobs']}, "
+          f"об'єднано: {metrics['coalesced']}, статуси: {statuses}")
+    if metrics["table_jobs"] + metrics["table_hits"] + metrics["coalesced"] != len(queries) - statuses.get("busy", 0):
+        print("Лічильники об'єднання не узгоджуються з кількістю запитів")
+        failures += 1
+    # повторне завдання для пари можливе лише після невдалого спуску, що скидає таблицю
+    if metrics["table_jobs"] > len(pairs) + statuses.get("not_found", 0):
+        print("Для однієї пари (p, alpha) запущено зайві завдання")
+        failures += 1
+    if statuses.get("busy") or not metrics["coalesced"]:
+        print("Одночасні запити не об'єднано")
+        failures += 1
+    return failures
+
+
+async def check_admission(client: ServiceClient, service: DiscreteLogService, rows) -> int:
+    # квота великих p вичерпується, а дрібні запити тим часом обслуговуються
+    alpha, beta, p = max(rows, key=lambda row: row[2])
+    service.limits["large"] = 1
+    service.large_bits = p.bit_length() - 1
+    service.tables.clear()
+    large = [asyncio.ensure_future(client.solve(alpha, (beta + i) % p, p, timeout=30)) for i in range(3)]
+    await asyncio.sleep(0.05)
+    small_alpha, small_beta, small_p = min(rows, key=lambda row: row[2])
+    small = await client.solve(small_alpha, small_beta, small_p)
+    statuses = [result["status"] for result in await asyncio.gather(*large)]
+    print(f"Великі p: {statuses}, дрібне p: {small['status']}")
+    failures = 0
+    if statuses.count("busy") != 2:
+        print("Квота великих p не спрацювала")
+        failures += 1
+    if small["status"] == "busy":
+        print("Дрібний запит відхилено через великі")
+        failures += 1
+    return failures
+
+
+async def main(input_file: str) -> int:
+    with open(input_file, newline="") as csvfile:
+        rows = [(int(row["alpha"]), int(row["beta"]), int(row["p"])) for row in csv.DictReader(csvfile)]
+    rows = [row for row in rows if row[2] < MAX_P]
+
+    service = DiscreteLogService(workers=2, max_pending=QUERY_LIMIT, max_pending_large=QUERY_LIMIT)
+    server = await service.start(port=0)
+    client = ServiceClient(port=server.sockets[0].getsockname()[1])
+    try:
+        health = await client.health()
+        failures = {
+            "health": 0 if health["status"] == "ok" else 1,
+            "coalescing": await check_coalescing(client, service, rows),
+            "admission": await check_admission(client, service, rows),
+        }
+    finally:
+        await service.close()
+    for name, count in failures.items():
+        print(f"{name}: {'OK' if count == 0 else f'{count} помилок'}")
+    return 1 if any(failures.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else INPUT_FILE)))
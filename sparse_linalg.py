@@ -0,0 +1,240 @@
+import random
+from array import array
+from math import gcd
+from typing import Callable, Dict, List, Optional, Tuple
+
+from cancellation import Deadline, check_deadline
+from number_theory import berlekamp_massey, is_probable_prime
+
+SparseRow = Dict[int, int]
+DenseSolver = Callable[[List[List[int]], List[int], int], Optional[List[int]]]
+
+
+class CSRMatrix:
+    def __init__(self, rows: List[SparseRow], ncols: int, mod: int):
+        self.nrows = len(rows)
+        self.ncols = ncols
+        self.indptr = array("I", [0])
+        self.indices = array("I")
+        self.data = array("q") if mod.bit_length() <= 62 else []
+        for row in rows:
+            for col in sorted(row):
+                val = row[col] % mod
+                if val:
+                    self.indices.append(col)
+                    self.data.append(val)
+            self.indptr.append(len(self.indices))
+
+    @property
+    def nnz(self) -> int:
+        return len(self.indices)
+
+    def matvec(self, x: List[int], mod: int) -> List[int]:
+        indptr, indices, data = self.indptr, self.indices, self.data
+        return [sum(data[j] * x[indices[j]] for j in range(indptr[i], indptr[i + 1])) % mod
+                for i in range(self.nrows)]
+
+
+class EchelonBasis:
+    """Ешелонна форма системи за простим модулем q, що поповнюється по одному рівнянню.
+
+    Кожне нове рівняння зводиться за вже наявними опорними рядками; якщо від нього
+    нічого не лишилося, воно лінійно залежне й відкидається. Опорний стовпець рядка —
+    найбільший (найрідше задіяне просте факторної бази), що зменшує заповнення.
+    """
+
+    def __init__(self, ncols: int, q: int):
+        self.ncols = ncols
+        self.q = q
+        self.pivots: Dict[int, Tuple[SparseRow, int]] = {}
+        self.rejected = 0
+        self.inconsistent = 0
+
+    @property
+    def rank(self) -> int:
+        return len(self.pivots)
+
+    @property
+    def complete(self) -> bool:
+        return len(self.pivots) == self.ncols
+
+    def add(self, row: SparseRow, rhs: int) -> bool:
+        q = self.q
+        row = {c: v % q for c, v in row.items() if v % q}
+        rhs %= q
+        while row:
+            col = max(row)
+            pivot = self.pivots.get(col)
+            if pivot is None:
+                inv = pow(row[col], -1, q)
+                self.pivots[col] = ({c: v * inv % q for c, v in row.items()}, rhs * inv % q)
+                return True
+            factor = row[col]
+            prow, prhs = pivot
+            for c, v in prow.items():
+                value = (row.get(c, 0) - factor * v) % q
+                if value:
+                    row[c] = value
+                else:
+                    row.pop(c, None)
+            rhs = (rhs - factor * prhs) % q
+        self.rejected += 1
+        if rhs:
+            # суперечливе рівняння: помилкове співвідношення або q не ділить порядок alpha
+            self.inconsistent += 1
+        return False
+
+    def solve(self) -> List[int]:
+        # зворотна підстановка: опорний рядок стовпця c містить лише стовпці, не більші за c;
+        # невизначені (вільні) стовпці лишаються нулями, як у gaussian_elimination_mod
+        x = [0] * self.ncols
+        for col in sorted(self.pivots):
+            row, rhs = self.pivots[col]
+            x[col] = (rhs - sum(v * x[c] for c, v in row.items() if c != col)) % self.q
+        return x
+
+
+def structured_gaussian_elimination(rows: List[SparseRow], b: List[int], ncols: int, mod: int, max_merge_weight: int = 2, deadline: Optional[Deadline] = None, stats: Optional[Dict] = None) -> Tuple[List[int], List[Tuple[int, SparseRow, int]], List[SparseRow], List[int]]:
+    rows = [{c: v % mod for c, v in row.items() if v % mod} for row in rows]
+    b = [v % mod for v in b]
+    col_rows: Dict[int, set] = {c: set() for c in range(ncols)}
+    for r, row in enumerate(rows):
+        for c in row:
+            col_rows[c].add(r)
+    alive = set(range(len(rows)))
+    eliminated: List[Tuple[int, SparseRow, int]] = []
+    # стовпці, де жоден коефіцієнт не оборотний за модулем (лише для складеного mod)
+    pivot_failures: set = set()
+
+    changed = True
+    while changed:
+        changed = False
+        check_deadline(deadline, "linear_algebra", eliminated=len(eliminated), cols=ncols)
+        for col in list(col_rows):
+            rs = col_rows.get(col)
+            if not rs or len(rs) > max_merge_weight:
+                continue
+            # опорний рядок — найлегший серед тих, де коефіцієнт оборотний за модулем
+            candidates = [r for r in rs if gcd(rows[r][col], mod) == 1]
+            if not candidates:
+                pivot_failures.add(col)
+                continue
+            pivot_failures.discard(col)
+            pivot = min(candidates, key=lambda r: len(rows[r]))
+            prow = rows[pivot]
+            inv = pow(prow[col], -1, mod)
+            for r in rs - {pivot}:
+                row = rows[r]
+                factor = row[col] * inv % mod
+                for c, v in prow.items():
+                    nv = (row.get(c, 0) - factor * v) % mod
+                    if nv:
+                        row[c] = nv
+                        col_rows[c].add(r)
+                    else:
+                        row.pop(c, None)
+                        col_rows[c].discard(r)
+                b[r] = (b[r] - factor * b[pivot]) % mod
+            for c in prow:
+                col_rows[c].discard(pivot)
+            alive.discard(pivot)
+            eliminated.append((col, prow, b[pivot]))
+            del col_rows[col]
+            changed = True
+
+    if stats is not None:
+        stats["sge_pivot_failures"] = stats.get("sge_pivot_failures", 0) + len(pivot_failures)
+    core_cols = sorted(c for c, rs in col_rows.items() if rs)
+    core_index = {c: i for i, c in enumerate(core_cols)}
+    core_rows, core_b = [], []
+    for r in sorted(alive):
+        if rows[r]:
+            core_rows.append({core_index[c]: v for c, v in rows[r].items()})
+            core_b.append(b[r])
+        elif b[r]:
+            # рядок звівся до 0 = b ≠ 0: система несумісна
+            core_rows.append({})
+            core_b.append(b[r])
+    return core_cols, eliminated, core_rows, core_b
+
+
+def wiedemann_solve(matrix: CSRMatrix, b: List[int], q: int, attempts: int = 3, deadline: Optional[Deadline] = None, stats: Optional[Dict] = None) -> Optional[List[int]]:
+    k = matrix.ncols
+    if k == 0:
+        return []
+    # невдалі спроби: вироджений мінімальний многочлен або розв'язок, що не пройшов перевірку
+    failed = 0
+    for _ in range(attempts):
+        # випадкове стиснення m x k системи до квадратної k x k: M = R A
+        mix = [{r: random.randint(1, q - 1) for r in random.sample(range(matrix.nrows), min(3, matrix.nrows))}
+               for _ in range(k)]
+        R = CSRMatrix(mix, matrix.nrows, q)
+
+        def apply(x: List[int]) -> List[int]:
+            return R.matvec(matrix.matvec(x, q), q)
+
+        rhs = R.matvec(b, q)
+        u = [random.randint(0, q - 1) for _ in range(k)]
+        seq, v = [], rhs
+        for i in range(2 * k):
+            if i % 64 == 0:
+                check_deadline(deadline, "linear_algebra", wiedemann_step=i, cols=k)
+            seq.append(sum(ui * vi for ui, vi in zip(u, v)) % q)
+            v = apply(v)
+        C = berlekamp_massey(seq, q)
+        L = len(C) - 1
+        if L == 0 or C[L] == 0:
+            failed += 1
+            continue
+        # f(z) = sum C[L - j] z^j; x = -(1 / f_0) * sum_{j >= 1} f_j M^(j-1) rhs
+        x = [C[0] * vi % q for vi in rhs]
+        for j in range(L - 1, 0, -1):
+            Mx = apply(x)
+            x = [(mi + C[L - j] * ri) % q for mi, ri in zip(Mx, rhs)]
+        scale = (-pow(C[L], -1, q)) % q
+        x = [xi * scale % q for xi in x]
+        if matrix.matvec(x, q) == [bi % q for bi in b]:
+            break
+        failed += 1
+    else:
+        x = None
+    if stats is not None:
+        stats["wiedemann_failed_attempts"] = stats.get("wiedemann_failed_attempts", 0) + failed
+    return x
+
+
+def solve_sparse_mod(rows: List[SparseRow], b: List[int], ncols: int, mod: int, dense_solver: Optional[DenseSolver] = None, stats: Optional[Dict] = None, deadline: Optional[Deadline] = None) -> Optional[List[int]]:
+    core_cols, eliminated, core_rows, core_b = structured_gaussian_elimination(rows, b, ncols, mod, deadline=deadline, stats=stats)
+    if stats is not None:
+        stats.update(sge_eliminated=len(eliminated), core_rows=len(core_rows), core_cols=len(core_cols),
+                     empty_cols=sum(1 for c in range(ncols) if not any(c in row for row in rows)))
+
+    solution = [0] * ncols
+    if core_cols or core_rows:
+        core_solution = None
+        if core_cols and is_probable_prime(mod):
+            core_solution = wiedemann_solve(CSRMatrix(core_rows, len(core_cols), mod), core_b, mod, deadline=deadline, stats=stats)
+            if stats is not None:
+                stats["wiedemann_failed"] = core_solution is None
+        if core_solution is None:
+            if dense_solver is None:
+                return None
+            if not core_cols:
+                if any(core_b):
+                    return None
+                core_solution = []
+            else:
+                dense = [[row.get(c, 0) for c in range(len(core_cols))] for row in core_rows]
+                core_solution = dense_solver(dense, core_b, mod)
+                if core_solution is None:
+                    return None
+        for c, val in zip(core_cols, core_solution):
+            solution[c] = val % mod
+
+    for col, prow, rhs in reversed(eliminated):
+        acc = rhs
+        for c, v in prow.items():
+            if c != col:
+                acc -= v * solution[c]
+        solution[col] = acc * pow(prow[col], -1, mod) % mod
+    return solution
@@ -0,0 +1,142 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import IO, Dict, Iterable, List, Optional
+
+from index_calculus import index_calculus
+from cancellation import Deadline, DeadlineExceeded
+from factor_base_log_cache import CACHE_DIR, FactorBaseLogCache
+
+# Запит — рядок JSON {"id": ..., "alpha": ..., "beta": ..., "p": ..., "n": ..., "timeout": ...}
+# (id, n і timeout необов'язкові); відповідь — рядок JSON з тим самим id, x, status і seconds.
+# Відповіді пишуться в порядку завершення, щойно готові, тож клієнт може чекати на кожну.
+
+_worker_state: Dict = {}
+
+
+def init_worker(cache_dir: Optional[str]) -> None:
+    # діагностичний вивід розв'язувача не повинен потрапляти в потік відповідей
+    sys.stdout = open(os.devnull, "w")
+    _worker_state["cache"] = FactorBaseLogCache(directory=cache_dir)
+
+
+def solve_query(query: Dict) -> Dict:
+    start = time.perf_counter()
+    result: Dict = {"id": query.get("id")}
+    try:
+        alpha, beta, p = int(query["alpha"]), int(query["beta"]), int(query["p"])
+        n = int(query.get("n") or p - 1)
+        deadline = Deadline(float(query["timeout"])) if query.get("timeout") is not None else None
+        x = index_calculus(alpha, beta, n, p, cache=_worker_state.get("cache"), deadline=deadline)
+        result.update(x=x, status="ok" if x is not None else "not_found")
+    except DeadlineExceeded as e:
+        result.update(x=None, status="timeout", phase=e.phase)
+    except Exception as e:
+        result.update(x=None, status="error", error=repr(e))
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+class SolverPool:
+    """Теплі процеси-розв'язувачі, що живуть упродовж усього потоку запитів.
+
+    Кожен процес тримає власний кеш логарифмів факторної бази й кеш простих. Запити
+    з однаковими (p, alpha) завжди потрапляють до одного процесу, тож таблицю для
+    них обчислює лише перший запит, а решта виконує тільки спуск.
+    """
+
+    def __init__(self, workers: int = 1, cache_dir: Optional[str] = CACHE_DIR):
+        self.workers = max(1, workers)
+        self.cache_dir = cache_dir
+        self.executors: List[Optional[ProcessPoolExecutor]] = [None] * self.workers
+
+    def __enter__(self) -> "SolverPool":
+        for slot in range(self.workers):
+            self._start(slot)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        for executor in self.executors:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+    def _start(self, slot: int) -> ProcessPoolExecutor:
+        executor = ProcessPoolExecutor(max_workers=1, initializer=init_worker, initargs=(self.cache_dir,))
+        self.executors[slot] = executor
+        return executor
+
+    def submit(self, query: Dict) -> Future:
+        slot = hash((str(query.get("p")), str(query.get("alpha")))) % self.workers
+        try:
+            return self.executors[slot].submit(solve_query, query)
+        except BrokenProcessPool:
+            # процес аварійно завершився — замість нього запускається новий
+            return self._start(slot).submit(solve_query, query)
+
+
+def run_stream(lines: Iterable[str], output: IO[str], workers: int = 1, max_in_flight: Optional[int] = None, cache_dir: Optional[str] = CACHE_DIR) -> Dict[str, int]:
+    max_in_flight = max_in_flight or 2 * max(1, workers)
+    # обмеження кількості запитів у роботі: читання входу чекає, доки звільниться місце
+    slots = threading.BoundedSemaphore(max_in_flight)
+    lock = threading.Lock()
+    counts: Dict[str, int] = {}
+
+    def write(result: Dict) -> None:
+        with lock:
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+
+    def finished(future: Future, query_id) -> None:
+        try:
+            write(future.result())
+        except Exception as e:
+            write({"id": query_id, "x": None, "status": "error", "error": repr(e)})
+        finally:
+            slots.release()
+
+    with SolverPool(workers, cache_dir) as pool:
+        for number, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                query = json.loads(line)
+                if not isinstance(query, dict):
+                    raise ValueError("запит має бути об'єктом JSON")
+            except ValueError as e:
+                write({"id": number, "x": None, "status": "error", "error": repr(e)})
+                continue
+            query.setdefault("id", number)
+            slots.acquire()
+            try:
+                future = pool.submit(query)
+            except Exception as e:
+                # запит не потрапив до пулу — його місце одразу звільняється
+                slots.release()
+                write({"id": query["id"], "x": None, "status": "error", "error": repr(e)})
+                continue
+            future.add_done_callback(lambda f, query_id=query["id"]: finished(f, query_id))
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Потоковий розв'язувач: запити JSONL на вході, відповіді JSONL на виході")
+    parser.add_argument("input", nargs="?", default="-", help="файл або канал із запитами (за замовчуванням stdin)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-in-flight", type=int, default=None)
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="каталог дискового кешу логарифмів ('' — лише пам'ять)")
+    args = parser.parse_args()
+
+    start = time.time()
+    with contextlib.ExitStack() as stack:
+        source = sys.stdin if args.input == "-" else stack.enter_context(open(args.input))
+        counts = run_stream(source, sys.stdout, args.workers, args.max_in_flight, args.cache_dir or None)
+    summary = ", ".join(f"{status}: {count}" for status, count in sorted(counts.items()))
+    print(f"Оброблено запитів за {time.time() - start:.2f} с ({summary})", file=sys.stderr)
@@ -0,0 +1,258 @@
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from candidates import CandidateStream
+from cancellation import Deadline, check_deadline
+from sparse_linalg import SparseRow
+
+# Векторизовані етапи для p < 2^63 на масивах uint64: кандидати, перевірка гладкості
+# (t векторних операцій на блок, по одній на просте факторної бази) і виключення Гауса.
+# gaussian_elimination_numpy не обмежена розміром модуля: понад 2^31 вона працює з цілими Python.
+INT64_LIMIT = 1 << 63
+# до цього модуля добуток двох лишків уміщується в int64 з запасом для відкладеного зведення
+LAZY_MOD_LIMIT = 1 << 31
+DIRECT_MULMOD_LIMIT = 1 << 32
+VECTOR_BLOCK_SIZE = 4096
+
+
+def supports(p: int) -> bool:
+    return p < INT64_LIMIT
+
+
+def mulmod(a, b, p: int) -> np.ndarray:
+    # a * b mod p без переповнення uint64; a, b — масиви або скаляри, менші за p
+    a = np.asarray(a, dtype=np.uint64)
+    b = np.asarray(b, dtype=np.uint64)
+    modulus = np.uint64(p)
+    if p < DIRECT_MULMOD_LIMIT:
+        return a * b % modulus
+    # множення порціями по w бітів множника: result < p < 2^(64-w), тож і result << w,
+    # і a * (w-бітна порція) вміщуються в 64 біти
+    bits = p.bit_length()
+    w = 64 - bits
+    mask = np.uint64((1 << w) - 1)
+    result = np.zeros(np.broadcast_shapes(a.shape, b.shape), dtype=np.uint64)
+    for shift in reversed(range(0, bits, w)):
+        result = (result << np.uint64(w)) % modulus
+        result = (result + a * ((b >> np.uint64(shift)) & mask) % modulus) % modulus
+    return result
+
+
+class UInt64Blocks:
+    """Блоки кандидатів CandidateStream у вигляді масивів uint64.
+
+    Значення блоку — value * (m^0, ..., m^(size-1)) mod p, де value — поточне
+    значення потоку, а m — його множник, тож на блок припадає одне векторне множення.
+    """
+
+    def __init__(self, stream: CandidateStream, size: int = VECTOR_BLOCK_SIZE):
+        self.stream = stream
+        self.size = size
+        powers = [0] * size
+        x = 1
+        for j in range(size):
+            powers[j] = x
+            x = x * stream.multiplier % stream.p
+        self.powers = np.array(powers, dtype=np.uint64)
+        self.k_step = stream.step * stream.streams % stream.n
+
+    def next(self, count: Optional[int] = None) -> Tuple[int, np.ndarray]:
+        stream = self.stream
+        count = self.size if count is None else count
+        k0 = stream.k
+        values = mulmod(self.powers[:count], stream.value, stream.p)
+        stream.seek(stream.position + count)
+        return k0, values
+
+    def exponent(self, k0: int, j: int) -> int:
+        return (k0 + j * self.k_step) % self.stream.n
+
+
+def smooth_screen(values: np.ndarray, factor_base: np.ndarray) -> np.ndarray:
+    # ділимо кожен кандидат на всі степені простих бази; гладкі перетворюються на 1
+    remaining = values.copy()
+    for q in factor_base:
+        divisible = np.flatnonzero(remaining % q == 0)
+        while divisible.size:
+            remaining[divisible] //= q
+            divisible = divisible[remaining[divisible] % q == 0]
+    return remaining == 1
+
+
+def smooth_exponents(values: np.ndarray, factor_base: np.ndarray) -> np.ndarray:
+    # матриця показників (кандидат x просте) для вже відібраних гладких кандидатів
+    remaining = values.copy()
+    exponents = np.zeros((len(values), len(factor_base)), dtype=np.int64)
+    for i, q in enumerate(factor_base):
+        divisible = np.flatnonzero(remaining % q == 0)
+        while divisible.size:
+            remaining[divisible] //= q
+            exponents[divisible, i] += 1
+            divisible = divisible[remaining[divisible] % q == 0]
+    return exponents
+
+
+def collect_relations_uint64(alpha: int, n: int, p: int, factor_base: List[int], needed: int, block_size: int = VECTOR_BLOCK_SIZE, counters: Optional[Dict] = None, deadline: Optional[Deadline] = None, seed: Optional[int] = None) -> Tuple[List[SparseRow], List[int]]:
+    primes = np.array(factor_base, dtype=np.uint64)
+    blocks = UInt64Blocks(CandidateStream(alpha, p, n, seed), block_size)
+    A: List[SparseRow] = []
+    b: List[int] = []
+    tested = smooth = 0
+    while len(A) < needed:
+        check_deadline(deadline, "relation_collection", relations=len(A), needed=needed, candidates_tested=tested)
+        k0, values = blocks.next()
+        tested += len(values)
+        hits = np.flatnonzero(smooth_screen(values, primes))
+        smooth += hits.size
+        if not hits.size:
+            continue
+        for j, exponents in zip(hits, smooth_exponents(values[hits], primes)):
+            row = {int(col): int(exponents[col]) % n for col in np.flatnonzero(exponents)}
+            row = {col: e for col, e in row.items() if e}
+            if row:
+                A.append(row)
+                b.append(blocks.exponent(k0, int(j)))
+            if len(A) >= needed:
+                break
+    if counters is not None:
+        counters.update(candidates_tested=tested, smooth_candidates=smooth, relations=len(A))
+    return A, b
+
+
+def gaussian_elimination_uint64(A: List[List[int]], b: List[int], mod: int, deadline: Optional[Deadline] = None) -> Optional[List[int]]:
+    # те саме виключення Гауса-Жордана, що й gaussian_elimination_mod, але рядок за рядком
+    # на uint64: однаковий вибір опорних елементів дає однаковий результат
+    if not supports(mod):
+        raise ValueError(f"gaussian_elimination_uint64: модуль {mod} не вміщується в 63 біти")
+    m = len(A[0])
+    M = np.array([[x % mod for x in row] + [v % mod] for row, v in zip(A, b)], dtype=np.uint64)
+    modulus = np.uint64(mod)
+    # незведені рядки обробляються так само, як у gaussian_elimination_numpy
+    raw_nonzero = np.array([[x != 0 for x in row] for row in A], dtype=bool)
+    touched = np.zeros(len(M), dtype=bool)
+
+    for col in range(m):
+        check_deadline(deadline, "linear_algebra", column=col, columns=m)
+        pivot_row = None
+        for row in np.flatnonzero(M[col:, col]) + col:
+            if math.gcd(int(M[row, col]), mod) == 1:
+                pivot_row = int(row)
+                break
+        if pivot_row is None:
+            continue
+        if pivot_row != col:
+            for array in (M, raw_nonzero, touched):
+                array[[col, pivot_row]] = array[[pivot_row, col]]
+        touched |= raw_nonzero[:, col]
+        touched[col] = True
+        M[col] = mulmod(M[col], pow(int(M[col, col]), -1, mod), mod)
+        others = np.flatnonzero(M[:, col])
+        others = others[others != col]
+        if others.size:
+            products = mulmod(M[col][None, :], M[others, col][:, None], mod)
+            M[others] = (M[others] + (modulus - products)) % modulus
+
+    solution = [0] * m
+    nonzero = np.where(touched[:, None], M[:, :m] != 0, raw_nonzero)
+    for row in range(len(M)):
+        if not nonzero[row].any():
+            if M[row, m] != 0:
+                return None
+        else:
+            solution[int(nonzero[row].argmax())] = int(M[row, m])
+    return solution
+
+
+def gaussian_elimination_numpy(A: List[List[int]], b: List[int], mod: int, deadline: Optional[Deadline] = None) -> Optional[List[int]]:
+    # те саме виключення Гауса-Жордана, що й gaussian_elimination_mod, з оновленням усіх
+    # рядків одним векторним кроком; для mod < 2^31 — int64 зі зведенням за модулем лише
+    # тоді, коли наступний крок міг би переповнити 63 біти, інакше — масив цілих Python
+    m = len(A[0])
+    lazy = mod < LAZY_MOD_LIMIT
+    M = np.array([[x % mod for x in row] + [v % mod] for row, v in zip(A, b)], dtype=np.int64 if lazy else object)
+    # рядок, якого не торкнулося жодне виключення, gaussian_elimination_mod лишає незведеним,
+    # і його провідний стовпець визначають ненульові (хоч і кратні mod) вхідні елементи
+    raw_nonzero = np.array([[x != 0 for x in row] for row in A], dtype=bool)
+    touched = np.zeros(len(M), dtype=bool)
+    # bound — найбільше можливе |M[i, j]|; кожен крок додає до нього щонайбільше (mod - 1)^2
+    growth = (mod - 1) ** 2
+    bound = mod - 1
+
+    for col in range(m):
+        check_deadline(deadline, "linear_algebra", column=col, columns=m)
+        column = M[:, col] % mod
+        pivot_row = None
+        for row in np.flatnonzero(column[col:]) + col:
+            if math.gcd(int(column[row]), mod) == 1:
+                pivot_row = int(row)
+                break
+        if pivot_row is None:
+            continue
+        if pivot_row != col:
+            for array in (M, column, raw_nonzero, touched):
+                array[[col, pivot_row]] = array[[pivot_row, col]]
+        touched |= raw_nonzero[:, col]
+        touched[col] = True
+        M[col] = M[col] % mod * pow(int(column[col]), -1, mod) % mod
+        column[col] = 0
+        others = np.flatnonzero(column)
+        if not others.size:
+            continue
+        if not lazy:
+            M[others] = (M[others] - column[others, None] * M[col]) % mod
+            continue
+        if bound + growth >= INT64_LIMIT:
+            M %= mod
+            bound = mod - 1
+        M[others] -= column[others, None] * M[col]
+        bound += growth
+
+    M %= mod
+    solution = [0] * m
+    nonzero = np.where(touched[:, None], M[:, :m] != 0, raw_nonzero)
+    for row in range(len(M)):
+        if not nonzero[row].any():
+            if M[row, m] != 0:
+                return None
+        else:
+            solution[int(nonzero[row].argmax())] = int(M[row, m])
+    return solution
+
+
+class VectorizedDescent:
+    """Спуск для індивідуального логарифма з блоковою векторною перевіркою гладкості.
+
+    Кандидати beta * alpha^l беруться з CandidateStream, тож кожен наступний
+    отримується одним множенням. Логарифм гладкого кандидата — скалярний добуток
+    його вектора показників на вектор логарифмів бази.
+    """
+
+    def __init__(self, factor_base: List[int], logs: List[int], n: int):
+        self.factor_base = np.array(factor_base, dtype=np.uint64)
+        self.logs = np.array(logs, dtype=object)
+        self.n = n
+        self.tested = 0
+        self.smooth = 0
+
+    def solve(self, alpha: int, beta: int, p: int, attempts: int = 1000, block_size: int = VECTOR_BLOCK_SIZE, deadline: Optional[Deadline] = None) -> Optional[int]:
+        n = self.n
+        if beta % p == 0:
+            return None
+        blocks = UInt64Blocks(CandidateStream(alpha, p, n, base=beta), min(block_size, attempts))
+        for start in range(0, attempts, blocks.size):
+            check_deadline(deadline, "descent", attempts=start)
+            l0, values = blocks.next(min(blocks.size, attempts - start))
+            mask = smooth_screen(values, self.factor_base)
+            self.tested += len(values)
+            hits = np.flatnonzero(mask)
+            if not hits.size:
+                continue
+            self.smooth += hits.size
+            combined = smooth_exponents(values[hits], self.factor_base).astype(object) @ self.logs
+            for j, log_value in zip(hits, combined):
+                x = (int(log_value) - blocks.exponent(l0, int(j))) % n
+                if pow(alpha, x, p) == beta % p:
+                    return x
+        return None